@@ -4,7 +4,10 @@ import sys
 import os
 from .columns import name as col_name, index as col_index
 
-if sys.platform == 'win32':
+import re, types, contextlib, functools, threading
+from datetime import datetime, timedelta
+
+def _prepare_windows():
     #This is required in order to make pyuno usable with the default python interpreter under windows
     #Some environment variables must be modified
 
@@ -35,13 +38,61 @@ if sys.platform == 'win32':
         paths += install_folder + path
     os.environ['PATH'] =  paths+ os.environ['PATH']
 
-import uno, re, zipfile, types, inspect, tempfile, shutil, subprocess
-from datetime import datetime, timedelta
+class _LazyUno(object):
+    """
+    Stands for the uno module until it is first used, so that importing oosheet does not load pyuno,
+    and works where it is not available, as for packing scripts with oosheet-pack.
+    """
+
+    def __getattr__(self, name):
+        global uno
+        if sys.platform == 'win32':
+            _prepare_windows()
+        import uno as module
+        uno = module
+        return getattr(module, name)
+
+uno = _LazyUno()
+
+class _Connection(object):
+    """A connection to one LibreOffice instance, shared by all objects created while it is in use"""
+
+    def __init__(self, url, macro_environment, context, model, dispatcher):
+        self.url = url
+        self.macro_environment = macro_environment
+        self.context = context
+        self.model = model
+        self.dispatcher = dispatcher
+        # sheet name or index -> (sheet, name), for the connected model
+        self.sheets = {}
+        # Increased each time cached sheets are invalidated, so that sheet names are read again
+        self.generation = 0
+        # Names of the model's sheets when they were cached
+        self.sheet_names = None
+        # Pending writes of a batch() block
+        self.batch = None
+
+    def alive(self):
+        """Checks with one call if the bridge to LibreOffice still works"""
+        try:
+            self.context.ServiceManager
+        except Exception:
+            return False
+        return True
+
+# Connection checked out from an OODocPool by the current thread
+_local = threading.local()
+
+def socket_url(port = 2002, host = 'localhost'):
+    """UNO url to connect to a LibreOffice instance accepting socket connections"""
+    return 'uno:socket,host=%s,port=%d;urp;StarOffice.ComponentContext' % (host, port)
 
-# http://codesnippets.services.openoffice.org/Office/Office.MessageBoxWithTheUNOBasedToolkit.snip
-from com.sun.star.awt import WindowDescriptor
-from com.sun.star.awt.WindowClass import MODALTOP
-from com.sun.star.awt.VclWindowPeerAttribute import OK
+def pipe_url(name):
+    """
+    UNO url to connect to a LibreOffice instance accepting connections on a named pipe, launched with
+    --accept="pipe,name=NAME;urp;StarOffice.ServiceManager". Pipes are local only, but faster than sockets.
+    """
+    return 'uno:pipe,name=%s;urp;StarOffice.ComponentContext' % name
 
 class OODoc(object):
     """
@@ -49,31 +100,56 @@ class OODoc(object):
     This is the actual wrapper around python-uno.
     """
 
-    _macro_environment = None
-    _context = None
-    _model = None
-    _dispatcher = None
-    _cached = False
+    # UNO url of the instance to connect to by default, when not inside a macro
+    url = os.environ.get('OOSHEET_UNO_URL', socket_url())
 
-    def __init__(self):
-        if not OODoc._dispatcher:
-            self.connect()
-        else:
-            self.load_cache()
-
-    def connect(self):
-        OODoc._macro_environment = self.macro_environment = self._detect_macro_environment()
-        OODoc._context = self.context = self.get_context()
-        OODoc._model = self.model = self.get_model()
-        OODoc._dispatcher = self.dispatcher = self.get_dispatcher()
+    # Connection used outside of OODocPool.connection() blocks, when no url is given
+    _default = None
+    # url -> connection
+    _connections = {}
 
-    def load_cache(self):
-        self.macro_environment = OODoc._macro_environment
-        self.context = OODoc._context
-        self.model = OODoc._model
-        self.dispatcher = OODoc._dispatcher
+    def __init__(self, url = None):
+        """
+        Objects work with the instance at OODoc.url, which can be set by the OOSHEET_UNO_URL environment
+        variable, unless another UNO url is given, see socket_url() and pipe_url(). Connections are
+        kept and shared by all objects.
+        """
+        if url is None:
+            connection = getattr(_local, 'connection', None) or OODoc._default
+        else:
+            connection = OODoc._connections.get(url)
+        if connection is None:
+            self.connect(url)
+        else:
+            self.load_cache(connection)
+
+    def connect(self, url = None):
+        """Connects to given url, by default OODoc.url, and keeps the connection for next objects"""
+        connection = OODoc._connections[url or OODoc.url] = self._open(url or OODoc.url)
+        if url is None:
+            OODoc._default = connection
+
+    def _open(self, url):
+        """Connects to the instance at given url, and returns the connection"""
+        self.url = url
+        self.macro_environment = self._detect_macro_environment()
+        self.context = self.get_context()
+        self.model = self.get_model()
+        self.dispatcher = self.get_dispatcher()
+        self.connection = _Connection(url, self.macro_environment, self.context, self.model, self.dispatcher)
+        return self.connection
+
+    def load_cache(self, connection = None):
+        connection = connection or OODoc._default
+        self.connection = connection
+        self.url = connection.url
+        self.macro_environment = connection.macro_environment
+        self.context = connection.context
+        self.model = connection.model
+        self.dispatcher = connection.dispatcher
 
     def _detect_macro_environment(self):
+        import inspect
         for layer in inspect.stack():
             if layer[1].startswith('vnd.sun.star.tdoc:'):
                 return True
@@ -87,7 +163,7 @@ class OODoc(object):
         else:
             # We have to connect by socket
             resolver = localContext.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", localContext)
-            return resolver.resolve( "uno:socket,host=localhost,port=2002;urp;StarOffice.ComponentContext" )
+            return resolver.resolve(self.url)
 
     def get_model(self):
         """
@@ -105,6 +181,44 @@ class OODoc(object):
         desktop = smgr.createInstanceWithContext( "com.sun.star.frame.Desktop", self.context)
         return desktop.getCurrentComponent()
 
+    def get_sheet(self, key):
+        """
+        A (sheet, name) tuple for the sheet of given name or index, sheet being a python-uno
+        com.sun.star.sheet.XSpreadsheet object. Sheets are looked up once and then cached, until
+        invalidate_sheets() is called or the names of the document's sheets change. Names are
+        read with one call each time, so sheets inserted, renamed, moved or removed through
+        python-uno are noticed.
+        """
+        names = tuple(self.model.Sheets.ElementNames)
+        if names != self.connection.sheet_names:
+            self.invalidate_sheets()
+            self.connection.sheet_names = names
+        try:
+            return self.connection.sheets[key]
+        except KeyError:
+            if isinstance(key, str):
+                sheet = self.model.Sheets.getByName(key)
+            else:
+                sheet = self.model.Sheets.getByIndex(key)
+            entry = self.connection.sheets[key] = (sheet, sheet.Name)
+            return entry
+
+    def _flush(self):
+        """Writes cells kept pending by a batch() block"""
+        if self.connection.batch is not None:
+            self.connection.batch.flush()
+
+    def invalidate_sheets(self):
+        """
+        Forgets cached sheets. This is done after every dispatch(), which is how OOSheet inserts,
+        renames or removes sheets, and when get_sheet() finds that sheet names changed. Code that
+        changes sheets through python-uno may call it to make objects created before the change
+        read their sheet names again.
+        """
+        self.connection.sheets.clear()
+        self.connection.sheet_names = None
+        self.connection.generation += 1
+
     def get_dispatcher(self):
         """
         A python-uno dispatcher object, of type com.sun.star.uno.XInterface
@@ -157,6 +271,9 @@ class OODoc(object):
 
         """
 
+        # Events see the cells written inside a batch() block
+        self._flush()
+
         if cmd.startswith('.uno:'):
             cmd = cmd.split(':')[1]
 
@@ -168,9 +285,15 @@ class OODoc(object):
 
         self.dispatcher.executeDispatch(self.model.getCurrentController(),
                                         '.uno:%s' % cmd, '', 0, args)
+        self.invalidate_sheets()
 
     def alert(self, msg, title = u'Alert'):
         """Opens an alert window with a message and title, and requires user to click 'Ok'"""
+        # http://codesnippets.services.openoffice.org/Office/Office.MessageBoxWithTheUNOBasedToolkit.snip
+        from com.sun.star.awt import WindowDescriptor
+        from com.sun.star.awt.WindowClass import MODALTOP
+        from com.sun.star.awt.VclWindowPeerAttribute import OK
+
         parentWin = self.model.CurrentController.Frame.ContainerWindow
 
         aDescriptor = WindowDescriptor()
@@ -215,20 +338,217 @@ class OODoc(object):
     def open(self, filename):
         """
         Opens a file. This can also be used to focus on one open document, if several documents are opened.
+        Objects created afterwards work with that document. The file is loaded by the desktop, so this
+        also works in instances with no document, as the ones connected to by OODocPool.
         """
-        self.dispatch('Open', ('URL', self._file_url(filename)))
+        self._flush()
+        desktop = self.context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", self.context)
+        model = desktop.loadComponentFromURL(self._file_url(filename), '_default', 0, ())
+        self.connection.model = self.model = model
+        self.invalidate_sheets()
 
     def quit(self):
         """Closes the OpenOffice.org instance"""
         self.dispatch('Quit')
 
+class OODocPool(object):
+    """
+    Connections to several LibreOffice instances, so that independent documents can be processed
+    in parallel, one per instance. Each worker thread checks out a connection, and while it holds it,
+    all OODoc and OOSheet objects created in that thread use it:
+
+    >>> pool = OODocPool(['uno:socket,host=localhost,port=2002;urp;StarOffice.ComponentContext',
+    ...                   'uno:socket,host=localhost,port=2003;urp;StarOffice.ComponentContext'])
+    >>> def work(filename):
+    ...     with pool.connection():
+    ...         OODoc().open(filename)
+    ...         OOSheet('a1').value = 1
+    >>> concurrent.futures.ThreadPoolExecutor(len(pool)).map(work, filenames)
+
+    Instances are connected to when first checked out, and connected to again after a checkout
+    that failed because its instance was gone, as when an OOFarm worker is restarted.
+    """
+
+    def __init__(self, urls):
+        import queue
+        self.urls = list(urls)
+        # Idle connections, or urls not connected yet
+        self._idle = queue.Queue()
+        for url in self.urls:
+            self._idle.put(url)
+
+    def __len__(self):
+        return len(self.urls)
+
+    @contextlib.contextmanager
+    def connection(self, timeout = None):
+        """
+        A context manager that checks out an idle connection, waiting at most timeout seconds
+        for one (forever by default, queue.Empty is raised after that), and returns it at the end.
+        If the block raises and the bridge turns out to be dead, the connection is dropped, and the
+        next checkout of its url connects again.
+        """
+        connection = self._idle.get(timeout = timeout)
+        try:
+            if not isinstance(connection, _Connection):
+                connection = OODoc.__new__(OODoc)._open(connection)
+        except Exception:
+            self._idle.put(connection)
+            raise
+
+        previous = getattr(_local, 'connection', None)
+        _local.connection = connection
+        released = connection
+        try:
+            yield connection
+        except Exception:
+            if not connection.alive():
+                released = connection.url
+            raise
+        finally:
+            _local.connection = previous
+            self._idle.put(released)
+
+class _Batch(object):
+    """
+    Cell writes kept pending by OOSheet.batch(). Writes are stored per cell and, when flushed,
+    merged into rectangles so that each rectangle is written with one call.
+    """
+
+    def __init__(self):
+        # sheet name -> (sheet, {(col, row): (data, formula)})
+        self.sheets = {}
+
+    @classmethod
+    @contextlib.contextmanager
+    def context(cls, connection):
+        if connection.batch is not None:
+            # Nested blocks join the outer one
+            yield connection.batch
+            return
+
+        batch = connection.batch = cls()
+        try:
+            yield batch
+        finally:
+            connection.batch = None
+            batch.flush()
+
+    def add(self, sheet, sheet_name, start_col, start_row, data, formulas):
+        cells = self.sheets.setdefault(sheet_name, (sheet, {}))[1]
+        for i, row in enumerate(data):
+            for j, item in enumerate(row):
+                cells[(start_col + j, start_row + i)] = (item, formulas)
+
+    def get(self, sheet_name, col, row):
+        if not self.sheets:
+            return None
+        try:
+            return self.sheets[sheet_name][1].get((col, row))
+        except KeyError:
+            return None
+
+    def flush(self):
+        sheets, self.sheets = self.sheets, {}
+        for sheet, cells in sheets.values():
+            for formulas in (False, True):
+                group = dict([ (position, item) for position, (item, is_formula) in cells.items()
+                               if is_formula == formulas ])
+                for (start_col, end_col, start_row, end_row) in self.rectangles(group):
+                    data = tuple(tuple(group[(col, row)] for col in range(start_col, end_col + 1))
+                                 for row in range(start_row, end_row + 1))
+                    rng = sheet.getCellRangeByPosition(start_col, start_row, end_col, end_row)
+                    if formulas:
+                        rng.setFormulaArray(data)
+                    else:
+                        rng.setDataArray(data)
+
+    @staticmethod
+    def rectangles(positions):
+        """
+        Splits a collection of (col, row) positions into (start_col, end_col, start_row, end_row)
+        rectangles. Each column is split in runs of consecutive rows, and runs spanning the
+        same rows in adjacent columns are joined.
+        """
+        columns = {}
+        for col, row in positions:
+            columns.setdefault(col, []).append(row)
+
+        rectangles = []
+        open_rectangles = {} # (start_row, end_row) -> [start_col, end_col]
+        for col in sorted(columns):
+            rows = sorted(columns[col])
+            runs = []
+            start = end = rows[0]
+            for row in rows[1:]:
+                if row != end + 1:
+                    runs.append((start, end))
+                    start = row
+                end = row
+            runs.append((start, end))
+
+            for run in runs:
+                rectangle = open_rectangles.get(run)
+                if rectangle and rectangle[1] == col - 1:
+                    rectangle[1] = col
+                else:
+                    if rectangle:
+                        rectangles.append((rectangle[0], rectangle[1]) + run)
+                    open_rectangles[run] = [col, col]
+
+        for run, rectangle in open_rectangles.items():
+            rectangles.append((rectangle[0], rectangle[1]) + run)
+
+        return rectangles
+
+def _general_string(value):
+    """A number as shown in standard format, with up to 15 significant digits and a dot as decimal separator"""
+    return ('%.15g' % value).upper()
+
+def _position(descriptor):
+    col = re.findall('^([A-Z]+)', descriptor)[0]
+    row = descriptor[len(col):]
+
+    col = col_index(col)
+    row = int(row) - 1
+
+    return col, row
+
+@functools.lru_cache(maxsize = 4096)
+def _parse_selector(selector):
+    """
+    Parses a selector string into (sheet_name, start_col, end_col, start_row, end_row).
+    Sheet name is None if not given. Results are cached, as the same selectors tend to be used over and over.
+    """
+    try:
+        sheet_name, cells = selector.split('.')
+    except ValueError:
+        sheet_name, cells = None, selector
+    cells = cells.replace('$', '').upper()
+
+    if ':' in cells:
+        (start, end) = cells.split(':')
+        if not re.match('^[A-Z]', end):
+            col, row = _position(start)
+            end = ''.join([col_name(col), end])
+        start_col, start_row = _position(start)
+        end_col, end_row = _position(end)
+    else:
+        start_col, start_row = _position(cells)
+        end_col, end_row = start_col, start_row
+
+    return sheet_name, start_col, end_col, start_row, end_row
+
 class OOSheet(OODoc):
     """
     Interacts with an OpenOffice.org Spreadsheet instance.
     This high-level library works with a group of cells defined by a selector.
     """
 
-    def __init__(self, selector = None, _row_sliced = False):
+    # Number of rows fetched or written per call when large ranges are processed in blocks
+    block_rows = 4096
+
+    def __init__(self, selector = None, _row_sliced = False, url = None):
         """
         Constructor gets a selector as parameter. Selector can be one of the following forms:
         a10
@@ -239,12 +559,16 @@ class OOSheet(OODoc):
         SheetX.a1:g10
 
         Selector is case-insensitive
+
+        An UNO url can be given to work with a LibreOffice instance other than the default one, see OODoc.
         """
-        super(OOSheet, self).__init__()
+        super(OOSheet, self).__init__(url)
+        self._row_sliced = _row_sliced
 
         if not selector:
             address = self.model.CurrentSelection.RangeAddress
-            self.sheet = self.model.Sheets.getByIndex(address.Sheet)
+            self.sheet, self._sheet_name = self.get_sheet(address.Sheet)
+            self._generation = self.connection.generation
             self.start_col = address.StartColumn
             self.end_col = address.EndColumn
             self.start_row = address.StartRow
@@ -252,28 +576,27 @@ class OOSheet(OODoc):
 
             return
 
-        try:
-            sheet_name, cells = selector.split('.')
-            self.sheet = self.model.Sheets.getByName(sheet_name)
-        except ValueError:
-            self.sheet = self.model.Sheets.getByIndex(0)
-            cells = selector
-        cells.replace('$', '')
-        cells = cells.upper()
-
-        if ':' in cells:
-            (start, end) = cells.split(':')
-            if not re.match('^[A-Z]', end):
-                col, row = self._position(start)
-                end = ''.join([col_name(col), end])
-            self.start_col, self.start_row = self._position(start)
-            self.end_col, self.end_row = self._position(end)
-        else:
-            col, row = self._position(cells)
-            self.start_col, self.end_col = col, col
-            self.start_row, self.end_row = row, row
+        sheet_name, self.start_col, self.end_col, self.start_row, self.end_row = _parse_selector(selector)
+        self.sheet, self._sheet_name = self.get_sheet(0 if sheet_name is None else sheet_name)
+        self._generation = self.connection.generation
 
-        self._row_sliced = _row_sliced
+    @classmethod
+    def _at(cls, connection, sheet, sheet_name, start_col, end_col, start_row, end_row, _row_sliced = False):
+        """
+        A new object for given boundaries in a sheet handle already at hand, without
+        building and parsing a selector nor looking the sheet up again.
+        """
+        obj = cls.__new__(cls)
+        obj.load_cache(connection)
+        obj.sheet = sheet
+        obj._sheet_name = sheet_name
+        obj._generation = connection.generation
+        obj.start_col = start_col
+        obj.end_col = end_col
+        obj.start_row = start_row
+        obj.end_row = end_row
+        obj._row_sliced = _row_sliced
+        return obj
 
     @property
     def selector(self):
@@ -287,13 +610,28 @@ class OOSheet(OODoc):
         return self._generate_selector(self.start_col, self.end_col,
                                        self.start_row, self.end_row)
 
+    @property
+    def sheet_name(self):
+        """
+        Name of the sheet of this selector. It's read again from the sheet after invalidate_sheets(),
+        so that it follows renames.
+        """
+        if self._generation != self.connection.generation:
+            self._sheet_name = self.sheet.Name
+            self._generation = self.connection.generation
+        return self._sheet_name
+
     def _generate_selector(self, start_col, end_col, start_row, end_row):
         start = '%s%d' % (col_name(start_col), start_row + 1)
         end = '%s%d' % (col_name(end_col), end_row + 1)
         if start != end:
-            return '%s.%s:%s' % (self.sheet.Name, start, end)
+            return '%s.%s:%s' % (self.sheet_name, start, end)
         else:
-            return '%s.%s' % (self.sheet.Name, start)
+            return '%s.%s' % (self.sheet_name, start)
+
+    def _spawn(self, start_col, end_col, start_row, end_row, _row_sliced = False):
+        """A new object of this class, with given boundaries in the same sheet"""
+        return OOSheet._at(self.connection, self.sheet, self.sheet_name, start_col, end_col, start_row, end_row, _row_sliced)
 
     @property
     def cell(self):
@@ -302,7 +640,145 @@ class OOSheet(OODoc):
         Only works if selector is a single cell, otherwise raises AssertionError"""
         assert self.start_col == self.end_col
         assert self.start_row == self.end_row
-        return self.sheet.getCellByPosition(self.start_col, self.start_row)
+        return self._cell_at(self.start_col, self.start_row)
+
+    def _cell_at(self, col, row):
+        """The python-uno cell object at given position in this selector's sheet"""
+        self._flush()
+        return self.sheet.getCellByPosition(col, row)
+
+    @property
+    def range(self):
+        """
+        A python-uno com.sun.star.table.XCellRange object, representing all cells of this selector.
+        Data of the whole range can be read or written through it in one call.
+        """
+        self._flush()
+        return self._range_at(self.start_col, self.end_col, self.start_row, self.end_row)
+
+    def _range_at(self, start_col, end_col, start_row, end_row):
+        """The python-uno com.sun.star.table.XCellRange of given rectangle in this selector's sheet"""
+        return self.sheet.getCellRangeByPosition(start_col, start_row, end_col, end_row)
+
+    def _read_array(self, start_col, end_col, start_row, end_row, formulas = False):
+        """Reads the data, or the formulas, of given rectangle in this selector's sheet with one call"""
+        self._flush()
+        rng = self._range_at(start_col, end_col, start_row, end_row)
+        if formulas:
+            return rng.getFormulaArray()
+        return rng.getDataArray()
+
+    def _read_strings(self, start_col, end_col, start_row, end_row, data = None, digits = True):
+        """
+        Reads the strings of given rectangle in this selector's sheet. Text comes from one getDataArray()
+        call, or from data if it was already read. Cells are grouped by number format with one call, and
+        formulas are located with another. Numbers in standard format are represented locally, unless they
+        are results of formulas, whose format may be inferred, and the other numbers are asked for their
+        strings one by one.
+
+        If digits is False, numbers in formats that always show digits are not asked, and given as None.
+        """
+        self._flush()
+        rng = self._range_at(start_col, end_col, start_row, end_row)
+        if data is None:
+            data = rng.getDataArray()
+        strings = [ [ item if isinstance(item, str) else None for item in row ] for row in data ]
+        if not any([ None in row for row in strings ]):
+            return tuple([ tuple(row) for row in strings ])
+
+        text_types = 0
+        for name in ('DATE', 'TIME', 'LOGICAL', 'TEXT', 'DEFINED'):
+            text_types |= uno.getConstantByName('com.sun.star.util.NumberFormat.' + name)
+        formats = self.model.getNumberFormats()
+
+        formulas = set()
+        flags = uno.getConstantByName('com.sun.star.sheet.CellFlags.FORMULA')
+        for address in rng.queryContentCells(flags).RangeAddresses:
+            formulas.update([ (row, col) for row in range(address.StartRow, address.EndRow + 1)
+                                         for col in range(address.StartColumn, address.EndColumn + 1) ])
+
+        # number format key -> (is standard, may show no digit, decimal separator if known)
+        kinds = {}
+        for group in rng.getUniqueCellFormatRanges():
+            key = group.NumberFormat
+            if key not in kinds:
+                number_format = formats.getByKey(key)
+                kinds[key] = [ key == formats.getStandardIndex(number_format.Locale),
+                               bool(number_format.Type & text_types), None ]
+            standard, text = kinds[key][:2]
+
+            for address in group.RangeAddresses:
+                for row in range(address.StartRow, address.EndRow + 1):
+                    i = row - start_row
+                    for col in range(address.StartColumn, address.EndColumn + 1):
+                        j = col - start_col
+                        item = data[i][j]
+                        if isinstance(item, str):
+                            continue
+                        if item is None:
+                            # Errors are shown by name
+                            strings[i][j] = rng.getCellByPosition(j, i).getString()
+                        elif standard and (row, col) not in formulas:
+                            string = _general_string(item)
+                            if '.' not in string:
+                                strings[i][j] = string
+                                continue
+                            if kinds[key][2] is not None:
+                                strings[i][j] = string.replace('.', kinds[key][2])
+                                continue
+                            # The decimal separator depends on locale, ask once
+                            strings[i][j] = rng.getCellByPosition(j, i).getString()
+                            if len(strings[i][j]) == len(string):
+                                kinds[key][2] = strings[i][j][string.index('.')]
+                        elif digits or standard or text:
+                            strings[i][j] = rng.getCellByPosition(j, i).getString()
+
+        return tuple([ tuple(row) for row in strings ])
+
+    def _write_array(self, start_col, start_row, data, formulas = False):
+        """
+        Writes a 2d-tuple of data, or of formulas, to this selector's sheet with one call,
+        data[0][0] going to the given position. Inside a batch() block, the write is kept pending.
+        """
+        if self.connection.batch is not None:
+            self.connection.batch.add(self.sheet, self.sheet_name, start_col, start_row, data, formulas)
+            return
+        rng = self._range_at(start_col, start_col + len(data[0]) - 1,
+                             start_row, start_row + len(data) - 1)
+        if formulas:
+            rng.setFormulaArray(data)
+        else:
+            rng.setDataArray(data)
+
+    @classmethod
+    def batch(cls):
+        """
+        A context manager that keeps cell writes pending until the end of the block:
+
+        >>> with OOSheet.batch():
+        ...     for i in range(1, 1001):
+        ...         OOSheet('b%d' % i).value = i
+
+        Values, strings, formulas and dates set inside the block are merged into as few rectangles
+        as possible, each written with one call when the block ends. Reading the value or string
+        of a cell answers the pending data when possible, otherwise pending writes are flushed
+        before reading, as they are before any dispatch.
+        """
+        return _Batch.context(OODoc().connection)
+
+    def _pending(self):
+        """A (data, formula) tuple with the pending write of this single-cell selector, or None"""
+        return self._pending_at(self.start_col, self.start_row)
+
+    def _pending_at(self, col, row):
+        """A (data, formula) tuple with the pending write of given cell in this selector's sheet, or None"""
+        if self.connection.batch is None:
+            return None
+        return self.connection.batch.get(self.sheet_name, col, row)
+
+    def _fill(self, data):
+        """A 2d-tuple in the dimensions of this selector, all items being the given data"""
+        return ((data,) * self.width,) * self.height
 
     @property
     def _cells(self):
@@ -336,20 +812,20 @@ class OOSheet(OODoc):
             row_sliced = True
 
         if not row_sliced:
-            return OOSheet(self._generate_selector(self.start_col,
-                                                   self.end_col,
-                                                   self.start_row + start,
-                                                   self.start_row + stop),
-                           _row_sliced = True)
+            return self._spawn(self.start_col,
+                               self.end_col,
+                               self.start_row + start,
+                               self.start_row + stop,
+                               _row_sliced = True)
         else:
-            return OOSheet(self._generate_selector(self.start_col + start,
-                                                   self.start_col + stop,
-                                                   self.start_row,
-                                                   self.end_row))
+            return self._spawn(self.start_col + start,
+                               self.start_col + stop,
+                               self.start_row,
+                               self.end_row)
 
 
     def __eq__(self, peer):
-        return ((self.sheet.Name == peer.sheet.Name) and
+        return ((self.sheet_name == peer.sheet_name) and
                 (self.start_row == peer.start_row) and
                 (self.start_col == peer.start_col) and
                 (self.end_row == peer.end_row) and
@@ -365,7 +841,7 @@ class OOSheet(OODoc):
         """
         for col in range(self.start_col, self.end_col+1):
             for row in range(self.start_row, self.end_row+1):
-                yield OOSheet(self._generate_selector(col, col, row, row))
+                yield self._spawn(col, col, row, row)
 
     @property
     def rows(self):
@@ -374,8 +850,7 @@ class OOSheet(OODoc):
         single-cell OOSheet object
         """
         for row in range(self.start_row, self.end_row+1):
-            yield OOSheet(self._generate_selector(self.start_col, self.end_col, row, row),
-                          _row_sliced = True)
+            yield self._spawn(self.start_col, self.end_col, row, row, _row_sliced = True)
 
     @property
     def columns(self):
@@ -384,17 +859,147 @@ class OOSheet(OODoc):
         single-cell OOSheet object
         """
         for col in range(self.start_col, self.end_col+1):
-            yield OOSheet(self._generate_selector(col, col, self.start_row, self.end_row))
+            yield self._spawn(col, col, self.start_row, self.end_row)
+
+    def iter_cells(self):
+        """
+        A generator of all cells of this selector, in the same order as cells, each one being
+        a lightweight OOCell object instead of an OOSheet. Meant for iterating over many cells.
+        """
+        for col in range(self.start_col, self.end_col+1):
+            for row in range(self.start_row, self.end_row+1):
+                yield OOCell(self, col, row)
 
 
+    @property
+    def values(self):
+        """
+        A 2d-tuple with all data of this selection at once, one tuple per row.
+        Uses Uno's getDataArray(), so numbers come as floats, text as strings,
+        empty cells as empty strings and cells whose formulas give errors as None.
+        """
+        return self._read_array(self.start_col, self.end_col, self.start_row, self.end_row)
 
     @property
     def data_array(self):
+        """Same as values, kept for compatibility"""
+        return self.values
+
+    @property
+    def formulas(self):
         """
-        A 2d-tuple with all data of this selection at once.
-        Uses Uno's getDataArray().
+        A 2d-tuple with the formulas of all cells of this selection, one tuple per row.
+        Uses Uno's getFormulaArray().
         """
-        return self.sheet.getCellRangeByName(self.selector).getDataArray()
+        return self._read_array(self.start_col, self.end_col, self.start_row, self.end_row,
+                                formulas = True)
+
+    @property
+    def strings(self):
+        """
+        A 2d-tuple with the strings of all cells of this selection, one tuple per row, as seen by the user.
+        Text is taken from one getDataArray() call, and numbers in standard format are represented
+        locally. Numbers in any other format, and results of formulas, cost one call per cell.
+        """
+        return self._read_strings(self.start_col, self.end_col, self.start_row, self.end_row)
+
+    def snapshot(self, strings = True):
+        """
+        Reads the values, formulas and strings of this selection at once, and returns them as an
+        OOSnapshot object. It has the same selector as this one, and can be navigated and queried
+        from memory as OOSheet objects are, without calling LibreOffice.
+
+        Strings are built from the values already read, and only numbers not in standard format,
+        or computed by formulas, cost one call each, see strings property. If strings is False, all
+        numbers are represented in standard format instead.
+        """
+        values = self.values
+        if strings:
+            strings = self._read_strings(self.start_col, self.end_col, self.start_row, self.end_row,
+                                         data = values)
+        else:
+            strings = tuple(tuple(_general_string(item) if isinstance(item, float) else item or ''
+                                  for item in row)
+                            for row in values)
+        grid = _SnapshotGrid(self.sheet_name, self.start_col, self.start_row,
+                             values, self.formulas, strings)
+        return OOSnapshot(grid, self.start_col, self.end_col, self.start_row, self.end_row)
+
+    def _row_blocks(self, block_rows = None):
+        """
+        A generator of (start_row, end_row) pairs splitting the rows of this selector in blocks
+        of at most block_rows rows. Defaults to OOSheet.block_rows.
+        """
+        block_rows = block_rows or self.block_rows
+        assert block_rows > 0
+        for start_row in range(self.start_row, self.end_row + 1, block_rows):
+            yield start_row, min(start_row + block_rows - 1, self.end_row)
+
+    def iter_blocks(self, block_rows = None):
+        """
+        A generator of the values of this selection in blocks of rows, each block being a 2d-tuple
+        as in values property. Each block is fetched with one call, so memory stays bounded however
+        large the selection is. Block size defaults to OOSheet.block_rows.
+        """
+        for start_row, end_row in self._row_blocks(block_rows):
+            yield self._read_array(self.start_col, self.end_col, start_row, end_row)
+
+    def iter_row_values(self, block_rows = None):
+        """
+        A generator of the values of each row of this selection, as plain tuples.
+        Rows are fetched in blocks, see iter_blocks().
+        """
+        for block in self.iter_blocks(block_rows):
+            for row in block:
+                yield row
+
+    def to_numpy(self, dtype = float, block_rows = None):
+        """
+        The values of this selection as a 2d numpy array, with NaN for empty, text and error cells.
+        Data is fetched in blocks of rows, so that a large selection never exists as a whole both
+        as python tuples and as the array. Requires numpy.
+
+        The array is allocated in the given dtype, and each block is stored in it as it arrives. Integer
+        and boolean types can't hold NaN, and raise ValueError if the selection has empty, text or error cells.
+        """
+        import numpy
+
+        dtype = numpy.dtype(dtype)
+        array = numpy.empty((self.height, self.width), dtype = dtype)
+        nan = numpy.nan
+        offset = 0
+        for block in self.iter_blocks(block_rows):
+            rows = [ [ item if isinstance(item, float) else nan for item in row ] for row in block ]
+            if dtype.kind in 'biu':
+                rows = numpy.array(rows)
+                if numpy.isnan(rows).any():
+                    raise ValueError('Empty, text or error cells have no %s value' % dtype)
+            array[offset:offset + len(block)] = rows
+            offset += len(block)
+        return array
+
+    def from_numpy(self, array, block_rows = None):
+        """
+        Writes a numpy array to the sheet, starting at the first cell of this selector. A 1d array is
+        written as a row. NaN items become empty cells. The array is written in blocks of rows.
+        The selector is resized to the dimensions of the array, and returned. Requires numpy.
+        """
+        import numpy
+
+        array = numpy.atleast_2d(array)
+        assert array.ndim == 2
+        height, width = array.shape
+        if not height or not width:
+            return self
+
+        self.end_col = self.start_col + width - 1
+        self.end_row = self.start_row + height - 1
+        for start_row, end_row in self._row_blocks(block_rows):
+            block = array[start_row - self.start_row:end_row - self.start_row + 1].tolist()
+            # NaN is the only value different from itself
+            data = tuple(tuple('' if item != item else float(item) for item in row) for row in block)
+            self._write_array(self.start_col, start_row, data)
+        return self
 
 
     def __repr__(self):
@@ -411,31 +1016,55 @@ class OOSheet(OODoc):
     def height(self):
         return self.end_row - self.start_row + 1
 
-    def _position(self, descriptor):
-        col = re.findall('^([A-Z]+)', descriptor)[0]
-        row = descriptor[len(col):]
-
-        col = col_index(col)
-        row = int(row) - 1
-
-        return col, row
-
     @property
     def basedate(self):
         """Hard-coded datetime.datetime object representing the date that corresponds to value 0"""
         return datetime(1899, 12, 30)
 
+    def _date_value(self, date):
+        """The float value corresponding to a datetime.datetime object, including the fraction of day"""
+        delta = date - self.basedate
+        return delta.days + (delta.seconds + delta.microseconds / 1000000.0) / 86400
+
+    def _standard_format(self, type_name):
+        """Key of the document's standard number format of given type, as DATE or DATETIME"""
+        format_type = uno.getConstantByName( "com.sun.star.util.NumberFormat." + type_name )
+        locale = uno.createUnoStruct( "com.sun.star.lang.Locale" )
+        return self.model.getNumberFormats().getStandardFormat( format_type, locale )
+
+    @property
+    def _date_format(self):
+        """Key of the document's standard date number format"""
+        return self._standard_format("DATE")
+
+    def _cell_ranges(self, rectangles):
+        """
+        A python-uno com.sun.star.sheet.SheetCellRanges object joining several rectangles of this sheet,
+        so that properties can be set to all of them at once.
+        Each rectangle is a (start_col, end_col, start_row, end_row) tuple.
+        """
+        sheet_index = self.sheet.getRangeAddress().Sheet
+        addresses = [ uno.createUnoStruct('com.sun.star.table.CellRangeAddress',
+                                          sheet_index, start_col, start_row, end_col, end_row)
+                      for (start_col, end_col, start_row, end_row) in rectangles ]
+        ranges = self.model.createInstance('com.sun.star.sheet.SheetCellRanges')
+        ranges.addRangeAddresses(tuple(addresses), False)
+        return ranges
+
     @property
     def value(self):
         """The float value of a cell. Only works for single-cell selectors"""
+        pending = self._pending()
+        if pending and not pending[1]:
+            # Text has value 0
+            return 0.0 if isinstance(pending[0], str) else pending[0]
         assert self.cell is not None
         return self.cell.getValue()
 
     @value.setter
     def value(self, value):
         """Sets the float value of all cells affected by this selector. Expects a float."""
-        for cell in self._cells:
-            cell.setValue(value)
+        self._write_array(self.start_col, self.start_row, self._fill(float(value)))
 
     def set_value(self, value):
         """Sets the float value of all cells affected by this selector. Expects a float."""
@@ -453,8 +1082,7 @@ class OOSheet(OODoc):
         """Sets the formula of all cells affected by this selector. Expects a string"""
         if not formula.startswith('='):
             formula = '=%s' % formula
-        for cell in self._cells:
-            cell.setFormula(formula)
+        self._write_array(self.start_col, self.start_row, self._fill(formula), formulas = True)
 
     def set_formula(self, formula):
         """Sets the formula of all cells affected by this selector. Expects a string"""
@@ -464,14 +1092,16 @@ class OOSheet(OODoc):
     @property
     def string(self):
         """The string representation of a cell. Only works for single-cell selectors"""
+        pending = self._pending()
+        if pending and not pending[1] and isinstance(pending[0], str):
+            return pending[0]
         assert self.cell is not None
         return self.cell.getString()
 
     @string.setter
     def string(self, string):
         """Sets the string of all cells affected by this selector. Expects a string."""
-        for cell in self._cells:
-            cell.setString(string)
+        self._write_array(self.start_col, self.start_row, self._fill(string))
 
     def set_string(self, string):
         """Sets the string of all cells affected by this selector. Expects a string."""
@@ -487,24 +1117,143 @@ class OOSheet(OODoc):
     @date.setter
     def date(self, date):
         """Sets the date of all cells affected by this selector. Expects a datetime.datetime object."""
-        delta = date - self.basedate
-        self.value = delta.days
-
-        date_format = uno.getConstantByName( "com.sun.star.util.NumberFormat.DATE" )
-        formats = self.model.getNumberFormats()
-        cells = self.sheet.getCellRangeByName(self.selector)
-        #if formats.getByKey(cells).Type != date_format:
-        for cell in self._cells:
-            if formats.getByKey(cell.NumberFormat).Type != date_format:
-                locale = uno.createUnoStruct( "com.sun.star.lang.Locale" )
-                cell.NumberFormat = formats.getStandardFormat( date_format, locale )
-
+        self.dates = date
 
     def set_date(self, date):
         """Sets the date of all cells affected by this selector. Expects a datetime.datetime object."""
         self.date = date
         return self
 
+    @property
+    def dates(self):
+        """
+        A 2d-tuple with the dates of all cells of this selection, one tuple per row, read in one call.
+        Cells not holding numbers, including errors, are given as None.
+        """
+        basedate = self.basedate
+        return tuple(tuple(basedate + timedelta(item) if isinstance(item, float) else None
+                           for item in row)
+                     for row in self.values)
+
+    @dates.setter
+    def dates(self, dates):
+        """
+        Sets the dates of all cells of this selection in one call. Expects either a datetime.datetime
+        object, to be set to all cells, or a 2d-sequence of them in the dimensions of the selection, with
+        None for empty cells. Cells not already formatted as dates get the date format.
+        """
+        if isinstance(dates, datetime):
+            data = self._fill(self._date_value(dates))
+        else:
+            data = tuple(tuple('' if date is None else self._date_value(date) for date in row)
+                         for row in dates)
+        self._write_array(self.start_col, self.start_row, data)
+        self._set_date_format()
+
+    def set_dates(self, dates):
+        """Sets the dates of all cells of this selection. See dates property."""
+        self.dates = dates
+        return self
+
+    def _set_date_format(self, rectangles = None, date_format = None):
+        """
+        Sets the date format to all cells of this selector, or of given rectangles, that are not formatted
+        as dates. Cells of each rectangle are grouped by format, so that each format is checked only once,
+        and all cells needing the format get it at once. The format defaults to the standard date format.
+        """
+        date_type = uno.getConstantByName( "com.sun.star.util.NumberFormat.DATE" )
+        formats = self.model.getNumberFormats()
+        if date_format is None:
+            date_format = self._date_format
+        if rectangles is None:
+            rectangles = [ (self.start_col, self.end_col, self.start_row, self.end_row) ]
+
+        undated = []
+        types = {}
+        for rectangle in rectangles:
+            rng = self._range_at(*rectangle)
+            groups = rng.getUniqueCellFormatRanges()
+            for group in groups:
+                key = group.NumberFormat
+                if key not in types:
+                    types[key] = formats.getByKey(key).Type
+                if not types[key] & date_type:
+                    undated.extend([ (address.StartColumn, address.EndColumn,
+                                      address.StartRow, address.EndRow)
+                                     for address in group.RangeAddresses ])
+
+        if len(rectangles) == 1 and len(groups) == 1 and undated:
+            # The whole range shares one format
+            rng.NumberFormat = date_format
+        elif undated:
+            self._cell_ranges(undated).NumberFormat = date_format
+
+    def write_grid(self, rows):
+        """
+        Writes a list of rows to the sheet in one call, starting at the first cell of this selector.
+        Items can be float, int, bool, str, datetime.datetime or None for an empty cell. Rows
+        shorter than the widest one are completed with empty cells.
+
+        Cells receiving dates and not formatted as dates yet are set to date format afterwards, all of
+        them at once, or to date and time format in columns whose dates have time.
+        The selector is resized to the dimensions of the grid, and returned.
+        """
+        rows = [ list(row) for row in rows ]
+        if not rows:
+            return self
+        width = max([ len(row) for row in rows ])
+        if not width:
+            return self
+
+        data = []
+        dates = {}
+        for i, row in enumerate(rows):
+            line = []
+            for j in range(width):
+                try:
+                    item = row[j]
+                except IndexError:
+                    item = None
+
+                if item is None:
+                    line.append('')
+                elif isinstance(item, datetime):
+                    line.append(self._date_value(item))
+                    dates.setdefault(j, []).append(i)
+                elif isinstance(item, (bool, int, float)):
+                    line.append(float(item))
+                elif isinstance(item, str):
+                    line.append(item)
+                else:
+                    raise TypeError('Cannot write %r to a cell' % (item,))
+            data.append(tuple(line))
+
+        self.end_col = self.start_col + width - 1
+        self.end_row = self.start_row + len(data) - 1
+        self._write_array(self.start_col, self.start_row, tuple(data))
+
+        if dates:
+            # Consecutive date cells of each column make one rectangle. Columns where some date
+            # has a fraction of day get date and time format
+            rectangles = { False: [], True: [] }
+            for j, indexes in sorted(dates.items()):
+                times = any([ data[i][j] % 1 for i in indexes ])
+                col = self.start_col + j
+                start = end = indexes[0]
+                for i in indexes[1:]:
+                    if i != end + 1:
+                        rectangles[times].append((col, col, self.start_row + start, self.start_row + end))
+                        start = i
+                    end = i
+                rectangles[times].append((col, col, self.start_row + start, self.start_row + end))
+
+            if rectangles[False]:
+                self._set_date_format(rectangles[False])
+            if rectangles[True]:
+                self._set_date_format(rectangles[True], self._standard_format("DATETIME"))
+
+        return self
+
     def focus(self):
         """Focuses on all cells of this selector"""
         self.dispatch('GoToCell', ('ToPoint', self.selector))
@@ -517,13 +1266,13 @@ class OOSheet(OODoc):
 
         if '.' in destiny:
             sheet_name, destiny = destiny.split('.')
-            assert sheet_name == self.sheet.Name
+            assert sheet_name == self.sheet_name
 
         self.focus()
-        self.dispatch('AutoFill', ('EndCell', '%s.%s' % (self.sheet.Name, destiny)))
+        self.dispatch('AutoFill', ('EndCell', '%s.%s' % (self.sheet_name, destiny)))
 
         if '.' not in destiny:
-            destiny = '.'.join([self.sheet.Name, destiny])
+            destiny = '.'.join([self.sheet_name, destiny])
 
         destiny = OOSheet(destiny)
         self.start_col = min(self.start_col, destiny.start_col)
@@ -535,13 +1284,13 @@ class OOSheet(OODoc):
 
     def delete_rows(self):
         """Delete all rows that intersect with this selector"""
-        self.focus()
-        self.dispatch('DeleteRows')
+        self._flush()
+        self.sheet.getRows().removeByIndex(self.start_row, self.height)
 
     def delete_columns(self):
         """Delete all columns that intersect with this selector"""
-        self.focus()
-        self.dispatch('DeleteColumns')
+        self._flush()
+        self.sheet.getColumns().removeByIndex(self.start_col, self.width)
 
     def insert_row(self):
         """Insert rows before this selector. The current selector is shift down, and expanded
@@ -550,9 +1299,8 @@ class OOSheet(OODoc):
 
     def insert_rows(self, num):
         """Works as insert_row(), but inserts several rows"""
-        self.focus()
-        for i in range(num):
-            self.dispatch('InsertRows')
+        self._flush()
+        self.sheet.getRows().insertByIndex(self.start_row, num)
         self.end_row += num
         return self
 
@@ -565,24 +1313,39 @@ class OOSheet(OODoc):
 
     def insert_columns(self, num):
         """Works as insert_column(), but inserts several columns"""
-        self.focus()
-        for i in range(num):
-            self.dispatch('InsertColumns')
+        self._flush()
+        self.sheet.getColumns().insertByIndex(self.start_col, num)
         self.end_col += num
         return self
 
     def flatten(self):
-        """Keeps the value and string of cells in selection, but make them independent of a formula."""
-        self.copy()
-        self.focus()
-        self.dispatch('InsertContents',
-                      ('Flags', 'SVDNT'),
-                      ('FormulaCommand', 0),
-                      ('SkipEmptyCells', False),
-                      ('Transpose', False),
-                      ('AsLink', False),
-                      ('MoveMode', 4),
-                      )
+        """
+        Keeps the value and string of cells in selection, but make them independent of a formula.
+        Results are read and written back as constants in blocks of OOSheet.block_rows rows, with
+        one call each, so neither the clipboard nor the focus are used. Formulas giving errors have
+        no value to keep, so they are left as they are and rows holding them are written around them.
+        """
+        for start_row, end_row in self._row_blocks():
+            data = self._read_array(self.start_col, self.end_col, start_row, end_row)
+            first = 0
+            for i, row in enumerate(data):
+                if None not in row:
+                    continue
+                if first < i:
+                    self._write_array(self.start_col, start_row + first, data[first:i])
+                first = i + 1
+                j = 0
+                while j < len(row):
+                    if row[j] is None:
+                        j += 1
+                        continue
+                    k = j
+                    while k < len(row) and row[k] is not None:
+                        k += 1
+                    self._write_array(self.start_col + j, start_row + i, (row[j:k],))
+                    j = k
+            if first < len(data):
+                self._write_array(self.start_col, start_row + first, data[first:])
         return self
 
     @property
@@ -599,13 +1362,13 @@ class OOSheet(OODoc):
         return self.clone().shrink_left(self.width - 1)
 
     def copy(self):
-        """Focuses and copies the contents, so it can be pasted somewhere else"""
+        """Focuses and copies the contents, so it can be pasted somewhere else. See also copy_to()"""
         self.focus()
         self.dispatch('Copy')
         return self
 
     def cut(self):
-        """Focuses and cuts the contents, they'll disappear and can be pasted somewhere"""
+        """Focuses and cuts the contents, they'll disappear and can be pasted somewhere. See also move_to()"""
         self.focus()
         self.dispatch('Cut')
         return self
@@ -616,6 +1379,35 @@ class OOSheet(OODoc):
         self.dispatch('Paste')
         return self
 
+    def copy_to(self, destiny):
+        """
+        Copies the cells of this selector, contents and formatting, to the destiny, given as a selector
+        string or an OOSheet object, whose first cell is the top left corner of the copy. Unlike copy()
+        and paste(), the clipboard and the focus are not used. Returns a selector for the copied cells.
+        """
+        destiny = self._destiny(destiny)
+        self.sheet.copyRange(destiny._cell_at(destiny.start_col, destiny.start_row).getCellAddress(),
+                             self.range.getRangeAddress())
+        return destiny
+
+    def move_to(self, destiny):
+        """
+        Works as copy_to(), but moves the cells, like cut() and paste() would.
+        Returns a selector for the moved cells.
+        """
+        destiny = self._destiny(destiny)
+        self.sheet.moveRange(destiny._cell_at(destiny.start_col, destiny.start_row).getCellAddress(),
+                             self.range.getRangeAddress())
+        return destiny
+
+    def _destiny(self, destiny):
+        """A selector with the size of this one, starting at the first cell of given selector"""
+        if not isinstance(destiny, OOSheet):
+            destiny = OOSheet(destiny)
+        destiny = destiny._spawn(destiny.start_col, destiny.start_col + self.width - 1,
+                                 destiny.start_row, destiny.start_row + self.height - 1)
+        return destiny
+
     def delete(self):
         """Deletes the contents of cells in this selector"""
         self.focus()
@@ -623,27 +1415,59 @@ class OOSheet(OODoc):
 
     def format_as(self, selector):
         """
-        Copies to the current selector the formmating of the given selector.
-        Internally, copies the other selector and does a "paste special" in the current cells,
-        pasting everything but data. No success has been achieved while trying to use the "brush" tool.
-        """
+        Copies to the current selector the formatting of the given selector, as a "paste special" of
+        formats would do: the cell style and the formatting set directly in each cell of the other
+        selector are applied to the current cells, repeating the other selector if it is smaller.
+        Formatting set directly in the current cells and not in the other selector is removed.
 
-        if type(selector) is type(self):
-            selector = selector.selector
+        This is done through cell properties, read once from the other selector and written in bulk,
+        so neither the clipboard nor the focus are used.
+        """
 
-        OOSheet(selector).copy()
-        self.focus()
-        self.dispatch('InsertContents',
-                      ('Flags', 'T'),
-                      ('FormulaCommand', 0),
-                      ('SkipEmptyCells', False),
-                      ('Transpose', False),
-                      ('AsLink', False),
-                      ('MoveMode', 4),
-                      )
-
-        self.dispatch('TerminateInplaceActivation')
-        self.dispatch('Cancel')
+        if not isinstance(selector, OOSheet):
+            selector = OOSheet(selector)
+        self._flush()
+
+        names = self._format_property_names(selector._cell_at(selector.start_col, selector.start_row))
+        tiles_down = max(1, self.height // selector.height)
+        tiles_right = max(1, self.width // selector.width)
+
+        for i in range(selector.height):
+            for j in range(selector.width):
+                source = selector._cell_at(selector.start_col + j, selector.start_row + i)
+                states = source.getPropertyStates(names)
+                direct = tuple(name for name, state in zip(names, states) if state.value == 'DIRECT_VALUE')
+                default = tuple(name for name, state in zip(names, states) if state.value != 'DIRECT_VALUE')
+                values = source.getPropertyValues(direct)
+                style = source.getPropertyValue('CellStyle')
+
+                rectangles = [ (self.start_col + j + b * selector.width, self.start_col + j + b * selector.width,
+                                self.start_row + i + a * selector.height, self.start_row + i + a * selector.height)
+                               for a in range(tiles_down) for b in range(tiles_right) ]
+                if len(rectangles) == 1:
+                    target = self._range_at(*rectangles[0])
+                elif selector.width == selector.height == 1:
+                    target = self._range_at(self.start_col, self.start_col + tiles_right - 1,
+                                            self.start_row, self.start_row + tiles_down - 1)
+                else:
+                    target = self._cell_ranges(rectangles)
+
+                target.setPropertyValue('CellStyle', style)
+                if default:
+                    target.setPropertiesToDefault(default)
+                if direct:
+                    target.setPropertyValues(direct, values)
+
+    # Writable cell properties that are not formatting, or are aliases of others
+    _not_format_properties = frozenset([ 'CellStyle', 'FormulaLocal',
+                                         'ValidationLocal', 'ValidationXML',
+                                         'ConditionalFormatLocal', 'ConditionalFormatXML' ])
+
+    def _format_property_names(self, cell):
+        """Sorted names of the writable formatting properties of a cell"""
+        readonly = uno.getConstantByName('com.sun.star.beans.PropertyAttribute.READONLY')
+        return tuple(sorted(prop.Name for prop in cell.getPropertySetInfo().getProperties()
+                            if not prop.Attributes & readonly and prop.Name not in self._not_format_properties))
 
     def shift(self, col, row):
         """
@@ -681,18 +1505,67 @@ class OOSheet(OODoc):
             return (self.start_col - tup.start_col, self.start_row - tup.start_row)
 
     def find(self, query):
+        """
+        A generator of single-cell objects of this selection matching the query, column by column.
+        The query can be a string, matched against the string of cells, a number, matched against
+        their value, or a function receiving each single-cell object and returning a boolean.
+
+        For strings and numbers, all data is fetched in one call and scanned locally. Strings of
+        numbers are read as in strings property, but numbers in formats that always show digits, as
+        currency or percent, are not asked for them when the query has no digit.
+        """
+        if type(query) is types.FunctionType:
+            for cell in self.cells:
+                if query(cell):
+                    yield cell
+            return
+
+        if not isinstance(query, (str, int, float)):
+            raise TypeError
+
         if isinstance(query, str):
-            test = lambda cell: cell.string == query
-        elif isinstance(query, int) or isinstance(query, float):
-            test = lambda cell: cell.value == query
-        elif type(query) is types.FunctionType:
-            test = query
+            data = self._read_strings(self.start_col, self.end_col, self.start_row, self.end_row,
+                                      digits = any([ char.isdigit() for char in query ]))
         else:
-            raise TypeError
+            data = self.values
+        for j, col in enumerate(range(self.start_col, self.end_col+1)):
+            for i, row in enumerate(range(self.start_row, self.end_row+1)):
+                if self._item_matches(data[i][j], query):
+                    yield self._spawn(col, col, row, row)
 
-        for cell in self.cells:
-            if test(cell):
-                yield cell
+    def search(self, text, regex = False, case = False, whole = False):
+        """
+        A generator of objects for each block of cells in this selection whose content contains text.
+        The search is done by LibreOffice itself, with one call, without moving data to python,
+        which makes it the fastest way of finding something in large sheets.
+
+        Options correspond to the ones in "Find & Replace" dialog:
+        - regex: text is a regular expression
+        - case: search is case sensitive
+        - whole: text must match the entire content of cell
+
+        Adjacent matching cells may be given together as a single multiple-cell object.
+        """
+        self._flush()
+        rng = self._range_at(self.start_col, self.end_col, self.start_row, self.end_row)
+        descriptor = rng.createSearchDescriptor()
+        descriptor.SearchString = text
+        descriptor.SearchRegularExpression = regex
+        descriptor.SearchCaseSensitive = case
+        descriptor.SearchWords = whole
+
+        found = rng.findAll(descriptor)
+        if found is None:
+            return
+
+        try:
+            addresses = found.RangeAddresses
+        except AttributeError:
+            addresses = [ found.getByIndex(i).getRangeAddress() for i in range(found.getCount()) ]
+
+        for address in addresses:
+            yield self._spawn(address.StartColumn, address.EndColumn,
+                              address.StartRow, address.EndRow)
 
     def each(self, function):
         if type(function) is not types.FunctionType:
@@ -713,18 +1586,215 @@ class OOSheet(OODoc):
         """Moves the selector up, but number of rows given by "num" parameter."""
         return self.shift(0, -num)
 
-    def _cell_matches(self, cell, value):
-        assert type(value) in (type(None), str, float, int, datetime)
+    def _item_matches(self, item, value):
+        """
+        Checks if a cell matches a value, given the item fetched for it: its formula if value is None,
+        its string if value is a string, otherwise its data. See shift_until() for how values are matched.
+        """
+        if value is None:
+            # Only empty cells have no formula
+            return item == ''
+        if isinstance(value, str):
+            return item == value
+
+        if not isinstance(item, float):
+            # Text and errors have value 0
+            item = 0.0
+        if isinstance(value, datetime):
+            return item == self._date_value(value)
+        return item == value
+
+    def _scan_limits(self, col, row):
+        """
+        The (min_col, max_col, min_row, max_row) limits of a scan in direction given by "col" and "row".
+        Only limits in that direction are meaningful.
+        """
+        max_col = self.sheet.getColumns().getCount() - 1 if col > 0 else self.end_col
+        max_row = self.sheet.getRows().getCount() - 1 if row > 0 else self.end_row
+        return 0, max_col, 0, max_row
 
-        if type(value) is str:
-            return cell.getString() == value
-        if type(value) in (float, int):
-            return cell.getValue() == value
-        if type(value) is datetime:
-            return cell.getValue() == (value - self.basedate).days
+    def _scan(self, ref_col, ref_row, col, row, formulas = False, strings = False, digits = True):
+        """
+        A generator of (step, col, row, item) for the cells starting at (ref_col, ref_row), in
+        steps of size given by "col" and "row", until the limit of sheet. Items are data of cells,
+        formulas, or strings, read with given digits as in _read_strings(). They are fetched in blocks,
+        starting small and doubling up to OOSheet.block_rows.
+        """
+        min_col, max_col, min_row, max_row = self._scan_limits(col, row)
+
+        def read(start_col, end_col, start_row, end_row):
+            if strings:
+                return self._read_strings(start_col, end_col, start_row, end_row, digits = digits)
+            return self._read_array(start_col, end_col, start_row, end_row, formulas)
+
+        # last step inside limits
+        last = None
+        for (ref, step, minimum, maximum) in ((ref_col, col, min_col, max_col),
+                                              (ref_row, row, min_row, max_row)):
+            if step > 0:
+                steps = (maximum - ref) // step
+            elif step < 0:
+                steps = (ref - minimum) // -step
+            else:
+                continue
+            last = steps if last is None else min(last, steps)
+
+        size = 32
+        first = 0
+        while first <= last:
+            end = min(first + size - 1, last)
+            cols = [ ref_col + col * k for k in (first, end) ]
+            rows = [ ref_row + row * k for k in (first, end) ]
+
+            if col and row:
+                # Diagonals can't be fetched in blocks
+                items = [ read(ref_col + col * k, ref_col + col * k,
+                               ref_row + row * k, ref_row + row * k)[0][0]
+                          for k in range(first, end + 1) ]
+            else:
+                block = read(min(cols), max(cols), min(rows), max(rows))
+                if col:
+                    items = list(block[0])
+                else:
+                    items = [ line[0] for line in block ]
+                if col < 0 or row < 0:
+                    items.reverse()
+                items = items[::abs(col or row)]
+
+            for k, item in enumerate(items, first):
+                yield k, ref_col + col * k, ref_row + row * k, item
+
+            first = end + 1
+            size = min(size * 2, self.block_rows)
+
+    def _steps_until(self, ref_col, ref_row, col, row, matches, formulas = False, strings = False,
+                     digits = True):
+        """
+        Number of steps of size given by "col" and "row" from (ref_col, ref_row) to the first cell
+        for which matches(col, row, item) is true, or None if there is none until the limit of sheet.
+        See _scan().
+        """
+        for k, c, r, item in self._scan(ref_col, ref_row, col, row, formulas, strings, digits):
+            if matches(c, r, item):
+                return k
+        return None
+
+    def _steps_to_empty(self, ref_col, ref_row, col, row):
+        """
+        Number of steps of size given by "col" and "row", one of them being 0, from (ref_col, ref_row)
+        to the first empty cell, or None if there is none until the limit of sheet.
+
+        Cells out of the used area are empty, so the used area bounds the search, and empty cells
+        in the line are queried at once. This takes a constant number of calls.
+        """
+        self._flush()
+        if col:
+            step, ref = col, ref_col
+        else:
+            step, ref = row, ref_row
+        used_start_col, used_end_col, used_start_row, used_end_row = self._used_area(start = step < 0)
+        if col:
+            used_start, used_end = used_start_col, used_end_col
+        else:
+            used_start, used_end = used_start_row, used_end_row
+
+        if step > 0:
+            if ref > used_end:
+                return 0
+            min_col, max_col, min_row, max_row = self._scan_limits(col, row)
+            limit = max_col if col else max_row
+            first, last = ref, min(used_end + step, limit)
+        else:
+            if ref < used_start:
+                return 0
+            first, last = max(used_start + step, 0), ref
+
+        if col:
+            rng = self._range_at(first, last, ref_row, ref_row)
+        else:
+            rng = self._range_at(ref_col, ref_col, first, last)
+
+        steps = None
+        for address in rng.queryEmptyCells().RangeAddresses:
+            if col:
+                start, end = address.StartColumn, address.EndColumn
+            else:
+                start, end = address.StartRow, address.EndRow
+            # first step landing inside this run of empty cells
+            if step > 0:
+                k = -(-(max(start, ref) - ref) // step)
+                found = ref + step * k <= end
+            else:
+                k = -(-(ref - min(end, ref)) // -step)
+                found = ref + step * k >= start
+            if found and (steps is None or k < steps):
+                steps = k
+        return steps
 
-        # value is None
-        return cell.getValue() == 0 and cell.getString() == '' and cell.getFormula() == ''
+    def _used_area(self, start = True):
+        """
+        The (start_col, end_col, start_row, end_row) of the used area of this selector's sheet, found
+        with a cell cursor. If start is False, the start is not looked for, and given as 0.
+        """
+        cursor = self.sheet.createCursor()
+        if start:
+            cursor.gotoStartOfUsedArea(False)
+        cursor.gotoEndOfUsedArea(True)
+        address = cursor.getRangeAddress()
+        return address.StartColumn, address.EndColumn, address.StartRow, address.EndRow
+
+    @property
+    def used_range(self):
+        """
+        A new object selecting the used area of this selector's sheet, from the first to the last
+        row and column with content. It's found in a constant number of calls, however large the sheet is.
+        """
+        self._flush()
+        return self._spawn(*self._used_area())
+
+    @property
+    def current_region(self):
+        """
+        A new object selecting the region of data around this selector, bounded by empty rows and
+        columns, as selected by ctrl-* in LibreOffice.
+        """
+        self._flush()
+        cursor = self.sheet.createCursorByRange(self._range_at(self.start_col, self.end_col,
+                                                               self.start_row, self.end_row))
+        cursor.collapseToCurrentRegion()
+        address = cursor.getRangeAddress()
+        return self._spawn(address.StartColumn, address.EndColumn, address.StartRow, address.EndRow)
+
+    def end_of_data(self, col, row):
+        """
+        Moves the selector in direction given by "col" and "row" parameters until its border reaches the
+        border of the current region of data, see current_region. Only the sign of parameters matters.
+        The border is the one of the whole region, so the selector may land on an empty cell if its own
+        column or row is shorter than the region.
+        """
+        region = self.current_region
+        if col > 0:
+            self.shift(region.end_col - self.end_col, 0)
+        elif col < 0:
+            self.shift(region.start_col - self.start_col, 0)
+        if row > 0:
+            self.shift(0, region.end_row - self.end_row)
+        elif row < 0:
+            self.shift(0, region.start_row - self.start_row)
+        return self
+
+    def end_of_data_right(self):
+        """Moves selector to right until the border of the current region. See end_of_data()"""
+        return self.end_of_data(1, 0)
+    def end_of_data_left(self):
+        """Moves selector to left until the border of the current region. See end_of_data()"""
+        return self.end_of_data(-1, 0)
+    def end_of_data_down(self):
+        """Moves selector down until the border of the current region. See end_of_data()"""
+        return self.end_of_data(0, 1)
+    def end_of_data_up(self):
+        """Moves selector up until the border of the current region. See end_of_data()"""
+        return self.end_of_data(0, -1)
 
     def shift_until(self, col, row, *args, **kwargs):
         """
@@ -743,57 +1813,72 @@ class OOSheet(OODoc):
         If column is given as condition, then shift must be horizontal, and vice-versa.
 
         If matching against a value, the type of the value given will be checked and either "value", "string"
-        or "date" property of cell will be used.
+        or "date" property of cell will be used. None matches empty cells, and is looked for in the sheet's
+        used area with a constant number of calls.
+
+        If matching against a lambda function, an object representing a single cell will be given as
+        parameter to the lambda function. It has "value", "string" and "date" of the cell, and anything
+        else is taken from a single-cell OOSheet object, created only when needed.
 
-        If matching against a lambda function, a single-cell OOSheet object will be given as parameter
-        to the lambda function.
+        Cells are fetched in blocks of growing size, and tested locally.
         """
 
         assert col != 0 or row != 0
 
-        try:
+        if args:
             value = args[0]
-            assert self.cell is not None
-            while not self._cell_matches(self.cell, value):
-                self.shift(col, row)
-            return self
-        except IndexError:
-            pass
-
-        assert len(kwargs.keys()) == 1
-        ref = list(kwargs.keys())[0]
-        value = kwargs[ref]
+            condition = None
+            assert self.start_col == self.end_col
+            assert self.start_row == self.end_row
+            ref_col, ref_row = self.start_col, self.start_row
+        else:
+            assert len(kwargs.keys()) == 1
+            ref = list(kwargs.keys())[0]
+            value = kwargs[ref]
 
-        reftype, position = ref.split('_')[:2]
+            reftype, position = ref.split('_')[:2]
 
-        if ref.endswith('_satisfies'):
-            condition = value
-        else:
-            condition = lambda s: s._cell_matches(s.cell, value)
+            if ref.endswith('_satisfies'):
+                condition = value
+            else:
+                condition = None
 
-        assert reftype in ('row', 'column')
+            assert reftype in ('row', 'column')
 
-        if reftype == 'row':
-            assert row == 0
-            ref_row = int(position) - 1
-            if col > 0:
-                ref_col = self.end_col
+            if reftype == 'row':
+                assert row == 0
+                ref_row = int(position) - 1
+                if col > 0:
+                    ref_col = self.end_col
+                else:
+                    ref_col = self.start_col
             else:
-                ref_col = self.start_col
+                assert col == 0
+                ref_col = col_index(position)
+                if row > 0:
+                    ref_row = self.end_row
+                else:
+                    ref_row = self.start_row
+
+        if condition is None and value is None and not (col and row):
+            k = self._steps_to_empty(ref_col, ref_row, col, row)
+        elif condition is None:
+            assert type(value) in (type(None), str, float, int, datetime)
+            strings = isinstance(value, str)
+            k = self._steps_until(ref_col, ref_row, col, row,
+                                  lambda c, r, item: self._item_matches(item, value),
+                                  formulas = value is None, strings = strings,
+                                  digits = strings and any([ char.isdigit() for char in value ]))
         else:
-            assert col == 0
-            ref_col = col_index(position)
-            if row > 0:
-                ref_row = self.end_row
-            else:
-                ref_row = self.start_row
+            k = self._steps_until(ref_col, ref_row, col, row,
+                                  lambda c, r, item: condition(_CellView(self, c, r, item)))
 
-        cell = OOSheet(self._generate_selector(ref_col, ref_col, ref_row, ref_row))
-        while not condition(cell):
-            self.shift(col, row)
-            cell.shift(col, row)
+        if k is not None:
+            return self.shift(col * k, row * k)
 
-        return self
+        # Same as shifting out of sheet
+        assert col >= 0 and row >= 0
+        raise IndexError('Condition not satisfied until the limit of sheet')
 
     def shift_right_until(self, *args, **kwargs):
         """Moves selector to right until condition is matched. See shift_until()"""
@@ -913,7 +1998,7 @@ class OOSheet(OODoc):
         Returns a clone of this selector.
         Useful to preserve a state before calls that modify the selector.
         """
-        return OOSheet(self.selector)
+        return self._spawn(self.start_col, self.end_col, self.start_row, self.end_row)
 
     def protect_sheet(self, password = ""):
         """
@@ -946,6 +2031,360 @@ class OOSheet(OODoc):
         return self
 
 
+class OOCell(object):
+    """
+    A single cell, as yielded by OOSheet.iter_cells(). It keeps only the selector it comes from,
+    its column and its row, and supports value, string, formula and date, reading and writing
+    them the same way an OOSheet does. Anything else is available from to_sheet().
+    """
+
+    __slots__ = ('owner', 'col', 'row')
+
+    def __init__(self, owner, col, row):
+        self.owner = owner
+        self.col = col
+        self.row = row
+
+    def to_sheet(self):
+        """A single-cell OOSheet object for this cell"""
+        return self.owner._spawn(self.col, self.col, self.row, self.row)
+
+    @property
+    def cell(self):
+        """A python-uno com.sun.star.table.XCell object, representing this cell"""
+        return self.owner._cell_at(self.col, self.row)
+
+    def _write(self, data, formulas = False):
+        self.owner._write_array(self.col, self.row, ((data,),), formulas)
+
+    @property
+    def value(self):
+        """The float value of this cell"""
+        pending = self.owner._pending_at(self.col, self.row)
+        if pending and not pending[1]:
+            return 0.0 if isinstance(pending[0], str) else pending[0]
+        return self.cell.getValue()
+
+    @value.setter
+    def value(self, value):
+        self._write(float(value))
+
+    @property
+    def string(self):
+        """The string representation of this cell"""
+        pending = self.owner._pending_at(self.col, self.row)
+        if pending and not pending[1] and isinstance(pending[0], str):
+            return pending[0]
+        return self.cell.getString()
+
+    @string.setter
+    def string(self, string):
+        self._write(string)
+
+    @property
+    def formula(self):
+        """The formula of this cell"""
+        return self.cell.getFormula()
+
+    @formula.setter
+    def formula(self, formula):
+        if not formula.startswith('='):
+            formula = '=%s' % formula
+        self._write(formula, formulas = True)
+
+    @property
+    def date(self):
+        """The date representation of this cell"""
+        return self.owner.basedate + timedelta(self.value)
+
+    @date.setter
+    def date(self, date):
+        self.to_sheet().date = date
+
+    def __repr__(self):
+        return '%s.%s%d' % (self.owner.sheet_name, col_name(self.col), self.row + 1)
+
+class _CellView(object):
+    """
+    Stands for a single-cell OOSheet object when testing conditions in OOSheet.shift_until().
+    Value, string and date come from data already fetched, where cells with errors are None and
+    have value 0. Anything else is asked to a full single-cell object, created when first needed,
+    and attributes set are set to it.
+    """
+
+    __slots__ = ('owner', 'col', 'row', 'item', '_full')
+
+    def __init__(self, owner, col, row, item):
+        self.owner = owner
+        self.col = col
+        self.row = row
+        self.item = item
+        self._full = None
+
+    @property
+    def full(self):
+        if self._full is None:
+            self._full = self.owner._spawn(self.col, self.col, self.row, self.row)
+        return self._full
+
+    @property
+    def value(self):
+        # Text and errors, fetched as None, have value 0
+        if not isinstance(self.item, float):
+            return 0.0
+        return self.item
+
+    @property
+    def string(self):
+        if isinstance(self.item, str):
+            return self.item
+        return self.full.string
+
+    @property
+    def date(self):
+        return self.owner.basedate + timedelta(self.value)
+
+    def __getattr__(self, name):
+        return getattr(self.full, name)
+
+    def __setattr__(self, name, value):
+        if name in _CellView.__slots__:
+            object.__setattr__(self, name, value)
+        else:
+            setattr(self.full, name, value)
+
+    def __repr__(self):
+        return repr(self.full)
+
+class _SnapshotGrid(object):
+    """
+    Data read by OOSheet.snapshot(), shared by an OOSnapshot object and all objects derived from it.
+    Cells around the captured region, one cell deep, are read as empty, so that the end of data can
+    be found. Reading cells further away raises IndexError.
+    """
+
+    def __init__(self, sheet_name, start_col, start_row, values, formulas, strings):
+        self.sheet_name = sheet_name
+        self.start_col = start_col
+        self.start_row = start_row
+        self.width = len(values[0])
+        self.height = len(values)
+        self.arrays = { 'values': values, 'formulas': formulas, 'strings': strings }
+
+    def item(self, kind, col, row):
+        i = row - self.start_row
+        j = col - self.start_col
+        if 0 <= i < self.height and 0 <= j < self.width:
+            return self.arrays[kind][i][j]
+        if -1 <= i <= self.height and -1 <= j <= self.width:
+            return ''
+        raise IndexError('Cell %s%d is out of snapshot' % (col_name(col), row + 1))
+
+    def array(self, kind, start_col, end_col, start_row, end_row):
+        return tuple(tuple(self.item(kind, col, row) for col in range(start_col, end_col + 1))
+                     for row in range(start_row, end_row + 1))
+
+class _SnapshotCell(object):
+    """Stands for a python-uno cell object, with data read from a snapshot"""
+
+    def __init__(self, grid, col, row):
+        self.grid = grid
+        self.col = col
+        self.row = row
+
+    def getValue(self):
+        value = self.grid.item('values', self.col, self.row)
+        if not isinstance(value, float):
+            return 0.0
+        return value
+
+    def getString(self):
+        return self.grid.item('strings', self.col, self.row)
+
+    def getFormula(self):
+        return self.grid.item('formulas', self.col, self.row)
+
+class OOSnapshot(OOSheet):
+    """
+    An immutable copy of the data of a selection, created by OOSheet.snapshot().
+
+    It supports the navigation and query API of OOSheet: indexing and slicing, cells, rows, columns,
+    values, strings, formulas, find(), and shift, grow and shrink methods, including the _until ones.
+    All of them are answered from memory, and each derived object shares the same data.
+
+    Cells can be read within the snapshot region and one cell around it, which is seen as empty.
+    Modifying data or dispatching events raises TypeError.
+    """
+
+    def __init__(self, grid, start_col, end_col, start_row, end_row, _row_sliced = False):
+        self._grid = grid
+        self.start_col = start_col
+        self.end_col = end_col
+        self.start_row = start_row
+        self.end_row = end_row
+        self._row_sliced = _row_sliced
+
+    @property
+    def sheet_name(self):
+        return self._grid.sheet_name
+
+    @property
+    def sheet(self):
+        raise TypeError('A snapshot is not connected to LibreOffice')
+
+    def _spawn(self, start_col, end_col, start_row, end_row, _row_sliced = False):
+        return OOSnapshot(self._grid, start_col, end_col, start_row, end_row, _row_sliced)
+
+    def _cell_at(self, col, row):
+        return _SnapshotCell(self._grid, col, row)
+
+    def _flush(self):
+        pass
+
+    def _pending_at(self, col, row):
+        return None
+
+    def _read_array(self, start_col, end_col, start_row, end_row, formulas = False):
+        return self._grid.array(formulas and 'formulas' or 'values',
+                                start_col, end_col, start_row, end_row)
+
+    def _read_strings(self, start_col, end_col, start_row, end_row, data = None, digits = True):
+        return self._grid.array('strings', start_col, end_col, start_row, end_row)
+
+    def _steps_to_empty(self, ref_col, ref_row, col, row):
+        return self._steps_until(ref_col, ref_row, col, row,
+                                 lambda c, r, item: item == '', formulas = True)
+
+    def _scan_limits(self, col, row):
+        grid = self._grid
+        return (max(grid.start_col - 1, 0), grid.start_col + grid.width,
+                max(grid.start_row - 1, 0), grid.start_row + grid.height)
+
+    def _write_array(self, start_col, start_row, data, formulas = False):
+        raise TypeError('A snapshot is read-only')
+
+    def dispatch(self, cmd, *args):
+        raise TypeError('A snapshot is read-only')
+
+def _wait_for(url, timeout):
+    """Waits until a LibreOffice instance accepts connections at given UNO url, for at most timeout seconds"""
+    import time
+    local_context = uno.getComponentContext()
+    resolver = local_context.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local_context)
+    deadline = time.time() + timeout
+    while True:
+        try:
+            return resolver.resolve(url)
+        except Exception:
+            if time.time() > deadline:
+                raise RuntimeError('LibreOffice not ready at %s after %d seconds' % (url, timeout))
+            time.sleep(0.5)
+
+class OOFarm(object):
+    """
+    Starts and supervises several headless LibreOffice processes, each one with its own user profile and
+    listening on its own port, so that documents can be processed in parallel:
+
+    >>> with OOFarm(4) as farm:
+    ...     pool = farm.pool()
+
+    Workers listen on consecutive ports starting at base_port. start() waits until all of them accept
+    connections, and check() restarts the ones that died. Each worker is given a blank spreadsheet,
+    so that OODoc and OOSheet objects connected to it have a document to work with.
+    """
+
+    def __init__(self, workers, base_port = 2002, soffice = 'soffice', timeout = 60):
+        self.ports = [ base_port + i for i in range(workers) ]
+        self.soffice = soffice
+        self.timeout = timeout
+        self.processes = [ None ] * workers
+        self.profiles = None
+
+    def __len__(self):
+        return len(self.ports)
+
+    @property
+    def urls(self):
+        """UNO urls to connect to each worker"""
+        return [ socket_url(port) for port in self.ports ]
+
+    def command(self, i):
+        """Command line that starts worker i"""
+        profile = uno.systemPathToFileUrl(os.path.join(self.profiles, 'worker%d' % i))
+        return [ self.soffice, '--headless', '--invisible', '--nologo', '--norestore', '--nodefault',
+                 '-env:UserInstallation=%s' % profile,
+                 '--accept=socket,host=localhost,port=%d;urp;StarOffice.ServiceManager' % self.ports[i] ]
+
+    def start(self):
+        """Starts all workers and waits until they are ready"""
+        import tempfile
+        if self.profiles is None:
+            self.profiles = tempfile.mkdtemp(prefix = 'oosheet-farm-')
+        for i in range(len(self)):
+            self._start(i)
+        for i in range(len(self)):
+            self._ready(i)
+        return self
+
+    def _start(self, i):
+        import subprocess
+        self.processes[i] = subprocess.Popen(self.command(i),
+                                             stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL)
+
+    def check(self):
+        """Restarts the workers whose process has exited, waits until they are ready and returns their indexes"""
+        dead = [ i for i, process in enumerate(self.processes) if process.poll() is not None ]
+        for i in dead:
+            self._start(i)
+        for i in dead:
+            self._ready(i)
+        return dead
+
+    def _ready(self, i):
+        """Waits until worker i accepts connections, and gives it a blank spreadsheet if it has no document"""
+        context = _wait_for(self.urls[i], self.timeout)
+        desktop = context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context)
+        if desktop.getCurrentComponent() is None:
+            desktop.loadComponentFromURL('private:factory/scalc', '_blank', 0, ())
+
+    def supervise(self, interval = 1):
+        """Keeps checking workers every interval seconds, until interrupted"""
+        import time
+        while True:
+            time.sleep(interval)
+            self.check()
+
+    def pool(self):
+        """An OODocPool with one connection to each worker"""
+        return OODocPool(self.urls)
+
+    def stop(self):
+        """Terminates all workers and removes their profiles"""
+        import subprocess, shutil
+        for url, process in zip(self.urls, self.processes):
+            if process is not None and process.poll() is None:
+                try:
+                    context = _wait_for(url, 0)
+                    context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", context).terminate()
+                except Exception:
+                    process.terminate()
+        for process in self.processes:
+            if process is not None:
+                try:
+                    process.wait(self.timeout)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+        self.processes = [ None ] * len(self)
+        if self.profiles is not None:
+            shutil.rmtree(self.profiles, ignore_errors = True)
+            self.profiles = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
 class OOPacker():
     """
     This class manipulates a document in OpenDocument format (the one used by OpenOffice.org)
@@ -958,6 +2397,7 @@ class OOPacker():
         "document_path" and "script" parameters are strings containing the filename of the OpenDocument
         document and Python script, respectively.
         """
+        import tempfile, zipfile
         self.script = script_path
         self.document = document_path
         self.tmp = tempfile.mkdtemp()
@@ -996,6 +2436,7 @@ class OOPacker():
 
     def pack(self):
         """Packs the Python script inside the document"""
+        import subprocess, shutil
         self.manifest_add('Scripts/')
         self.manifest_add('Scripts/python/')
         self.manifest_add('Scripts/python/%s' % self.script_name)
@@ -1041,10 +2482,151 @@ def print_help():
     print("Usage: %s document script.py" % script_name)
     sys.exit(1)
 
+def _positive(text):
+    """Argument type for counts that must be at least 1"""
+    import argparse
+    number = int(text)
+    if number < 1:
+        raise argparse.ArgumentTypeError('must be at least 1')
+    return number
+
+def _farm_arguments(parser):
+    parser.add_argument('--port', type = int, default = 2002, help = 'port of first worker, others follow it')
+    parser.add_argument('--soffice', default = 'soffice', help = 'LibreOffice executable')
+    parser.add_argument('--timeout', type = int, default = 60, help = 'seconds to wait for a worker to be ready')
+
 def launch():
-    print("""
+    """
+    Command line to launch LibreOffice. Acessed as "oosheet-launch".
+    With --workers, starts and supervises a farm of headless instances until interrupted.
+    """
+    import argparse
+    parser = argparse.ArgumentParser(prog = 'oosheet-launch')
+    parser.add_argument('--workers', type = _positive, help = 'number of headless instances to start')
+    _farm_arguments(parser)
+    args = parser.parse_args()
+
+    if not args.workers:
+        print("""
 # This is just a reminder of the complicated command needed to launch
 # LibreOffice with proper parameters to be controlled by sockets
 
   libreoffice --calc --accept="socket,host=localhost,port=2002;urp;StarOffice.ServiceManager"
+
+# Local connections are faster through a named pipe, with OOSHEET_UNO_URL="uno:pipe,name=oosheet;urp;StarOffice.ComponentContext"
+
+  libreoffice --calc --accept="pipe,name=oosheet;urp;StarOffice.ServiceManager"
+
+# To start several headless instances, restarting them if they crash:
+
+  oosheet-launch --workers 4
 """)
+        return
+
+    farm = OOFarm(args.workers, args.port, args.soffice, args.timeout)
+    try:
+        farm.start()
+        for url in farm.urls:
+            print(url)
+        farm.supervise()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        farm.stop()
+
+def _init_run_worker(url):
+    """Binds an oosheet-run worker process to one LibreOffice instance"""
+    OODoc.url = url
+
+def _run_job(job):
+    """
+    Runs a script for a document in an oosheet-run worker process. The document is loaded hidden and
+    closed afterwards. Returns an error message, or None.
+    """
+    import runpy, traceback
+    script, filename, timeout = job
+    try:
+        if OODoc._default is None:
+            _wait_for(OODoc.url, timeout)
+        doc = OODoc()
+        desktop = doc.context.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", doc.context)
+        model = desktop.loadComponentFromURL(uno.systemPathToFileUrl(os.path.abspath(filename)),
+                                             '_blank', 0, doc.args('Hidden', True))
+        doc.connection.model = model
+        doc.invalidate_sheets()
+
+        argv, sys.argv = sys.argv, [script, filename]
+        try:
+            runpy.run_path(script, run_name = '__main__')
+        except SystemExit as exit:
+            if exit.code:
+                raise
+        finally:
+            sys.argv = argv
+            model.close(True)
+    except (Exception, SystemExit):
+        # The instance may have crashed, connect again for next job
+        OODoc._default = None
+        return '%s: %s' % (filename, traceback.format_exc())
+
+def run():
+    """
+    Command line to run a script for many documents in parallel. Acessed as "oosheet-run".
+    """
+    import argparse, multiprocessing, concurrent.futures
+    from concurrent.futures.process import BrokenProcessPool
+    parser = argparse.ArgumentParser(prog = 'oosheet-run',
+                                     description = 'Runs a script once for each document, in parallel headless '
+                                     'LibreOffice instances. The script finds the document loaded, and its '
+                                     'filename in sys.argv[1].')
+    parser.add_argument('--workers', type = _positive, default = os.cpu_count() or 1,
+                        help = 'number of headless instances and processes')
+    _farm_arguments(parser)
+    parser.add_argument('script')
+    parser.add_argument('files', nargs = '+')
+    args = parser.parse_args()
+
+    workers = min(args.workers, len(args.files))
+    jobs = [ (args.script, filename, args.timeout) for filename in args.files ]
+    waiting = list(reversed(jobs))
+    failures = 0
+    with OOFarm(workers, args.port, args.soffice, args.timeout) as farm:
+        # Processes must not inherit the bridges opened by the farm
+        context = multiprocessing.get_context('spawn')
+
+        def executor(url):
+            # One process per instance, so that a process that dies only loses its own job
+            return concurrent.futures.ProcessPoolExecutor(1, mp_context = context,
+                                                          initializer = _init_run_worker, initargs = (url,))
+
+        executors = [ executor(url) for url in farm.urls ]
+        idle = list(range(workers))
+        running = {}
+        try:
+            while waiting or running:
+                while waiting and idle:
+                    i = idle.pop()
+                    job = waiting.pop()
+                    running[executors[i].submit(_run_job, job)] = (i, job)
+
+                done = concurrent.futures.wait(running, return_when = concurrent.futures.FIRST_COMPLETED).done
+                for future in done:
+                    i, job = running.pop(future)
+                    try:
+                        error = future.result()
+                    except BrokenProcessPool:
+                        error = '%s: worker process exited\n' % job[1]
+                        executors[i].shutdown(wait = False)
+                        executors[i] = executor(farm.urls[i])
+                    if error:
+                        failures += 1
+                        sys.stderr.write(error)
+                        farm.check()
+                    idle.append(i)
+        finally:
+            for pool in executors:
+                pool.shutdown()
+
+    if failures:
+        sys.stderr.write('%d of %d documents failed\n' % (failures, len(jobs)))
+        sys.exit(1)
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+
+"""
+Asyncio interface to OOSheet. Bridge calls block until LibreOffice answers, so each connection gets
+a thread of its own where all its calls are made, and coroutines await them there:
+
+>>> from oosheet.aio import AsyncOOSheet
+>>> async def total():
+...     values = await AsyncOOSheet('a1:a100').values()
+...     await AsyncOOSheet('b1').set_value(sum(values[i][0] for i in range(100)))
+
+Calls to the same connection run one at a time, in the order they were made, while calls to different
+connections, and any other I/O, overlap.
+"""
+
+import asyncio, concurrent.futures, functools, threading
+
+from . import OODoc, OOSheet, _local
+
+# UNO url -> executor running all calls to that connection. None is the default connection.
+_executors = {}
+_executors_lock = threading.Lock()
+
+def _bind(url):
+    """Connects the executor's thread to given url, or leaves it using the default connection"""
+    if url is not None:
+        _local.connection = OODoc.__new__(OODoc)._open(url)
+
+def _executor(url):
+    with _executors_lock:
+        try:
+            return _executors[url]
+        except KeyError:
+            executor = _executors[url] = concurrent.futures.ThreadPoolExecutor(
+                1, thread_name_prefix = 'oosheet', initializer = _bind, initargs = (url,))
+            return executor
+
+class AsyncOODoc(object):
+    """
+    Awaitable OODoc operations. The url is the one of the LibreOffice instance to work with,
+    by default the same one OODoc connects to.
+    """
+
+    def __init__(self, url = None):
+        self.url = url
+
+    async def run(self, function, *args, **kwargs):
+        """Calls function in this connection's thread, and returns its result"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor(self.url), functools.partial(function, *args, **kwargs))
+
+    def _doc(self):
+        return OODoc()
+
+    async def call(self, function, *args):
+        """
+        Calls function in this connection's thread, giving it the synchronous object this one stands for
+        and args, and returns its result. OOSheet results are returned as AsyncOOSheet objects.
+        """
+        def call():
+            return self._wrap(function(self._doc(), *args))
+        return await self.run(call)
+
+    def _wrap(self, result):
+        if isinstance(result, OOSheet):
+            return AsyncOOSheet(result.selector, self.url)
+        return result
+
+    async def dispatch(self, cmd, *args):
+        """See OODoc.dispatch()"""
+        return await self.call(lambda doc: doc.dispatch(cmd, *args))
+
+    async def undo(self):
+        """See OODoc.undo()"""
+        return await self.call(lambda doc: doc.undo())
+
+    async def redo(self):
+        """See OODoc.redo()"""
+        return await self.call(lambda doc: doc.redo())
+
+    async def save_as(self, filename):
+        """See OODoc.save_as()"""
+        return await self.call(lambda doc: doc.save_as(filename))
+
+    async def open(self, filename):
+        """See OODoc.open()"""
+        return await self.call(lambda doc: doc.open(filename))
+
+    async def quit(self):
+        """See OODoc.quit()"""
+        return await self.call(lambda doc: doc.quit())
+
+class AsyncOOSheet(AsyncOODoc):
+    """
+    Awaitable OOSheet operations on a selector, see OOSheet for selectors. The OOSheet object is
+    created in the connection's thread for each call. Anything not offered here can be done with call():
+
+    >>> await AsyncOOSheet('a1:g10').call(lambda sheet: sheet.shift_down_until(column_c = 'total'))
+    """
+
+    def __init__(self, selector = None, url = None):
+        super(AsyncOOSheet, self).__init__(url)
+        self.selector = selector
+
+    def _doc(self):
+        return OOSheet(self.selector)
+
+    def __repr__(self):
+        return '<AsyncOOSheet %s>' % self.selector
+
+    async def values(self):
+        """See OOSheet.values"""
+        return await self.call(lambda sheet: sheet.values)
+
+    async def formulas(self):
+        """See OOSheet.formulas"""
+        return await self.call(lambda sheet: sheet.formulas)
+
+    async def strings(self):
+        """See OOSheet.strings"""
+        return await self.call(lambda sheet: sheet.strings)
+
+    async def dates(self):
+        """See OOSheet.dates"""
+        return await self.call(lambda sheet: sheet.dates)
+
+    async def to_numpy(self, *args, **kwargs):
+        """See OOSheet.to_numpy()"""
+        return await self.call(lambda sheet: sheet.to_numpy(*args, **kwargs))
+
+    async def set_value(self, value):
+        """See OOSheet.set_value()"""
+        return await self.call(lambda sheet: sheet.set_value(value))
+
+    async def set_string(self, string):
+        """See OOSheet.set_string()"""
+        return await self.call(lambda sheet: sheet.set_string(string))
+
+    async def set_formula(self, formula):
+        """See OOSheet.set_formula()"""
+        return await self.call(lambda sheet: sheet.set_formula(formula))
+
+    async def set_dates(self, dates):
+        """See OOSheet.set_dates()"""
+        return await self.call(lambda sheet: sheet.set_dates(dates))
+
+    async def write_grid(self, rows):
+        """See OOSheet.write_grid()"""
+        return await self.call(lambda sheet: sheet.write_grid(rows))
+
+    async def from_numpy(self, array, *args, **kwargs):
+        """See OOSheet.from_numpy()"""
+        return await self.call(lambda sheet: sheet.from_numpy(array, *args, **kwargs))
+
+    async def delete(self):
+        """See OOSheet.delete()"""
+        return await self.call(lambda sheet: sheet.delete())
@@ -1,6 +1,11 @@
 # -*- coding: utf-8 -*-
 
-def index(name):
+import itertools
+
+# Number of columns of a LibreOffice sheet, from A to XFD
+MAX_COLUMNS = 16384
+
+def _compute_index(name):
     letters = [l for l in name.upper()]
     letters.reverse()
     index = 0
@@ -11,7 +16,7 @@ def index(name):
     return index - 1
 
 
-def name(index):
+def _compute_name(index):
     name = []
     letters = [chr(ord('A')+i) for i in range(26)]
 
@@ -25,3 +30,46 @@ def name(index):
 
     name.reverse()
     return ''.join(name)
+
+def _names():
+    for length in itertools.count(1):
+        for letters in itertools.product('ABCDEFGHIJKLMNOPQRSTUVWXYZ', repeat = length):
+            yield ''.join(letters)
+
+# Column names of the whole sheet, by index, and the other way round. Built on first use.
+_NAMES = None
+_INDEXES = None
+
+def _build_tables():
+    global _NAMES, _INDEXES
+    _NAMES = tuple(itertools.islice(_names(), MAX_COLUMNS))
+    _INDEXES = dict((name, index) for index, name in enumerate(_NAMES))
+
+def index(name):
+    """Index of a column, given its name, case-insensitive. Column A is 0"""
+    if _INDEXES is None:
+        _build_tables()
+    try:
+        return _INDEXES[name]
+    except KeyError:
+        pass
+    try:
+        return _INDEXES[name.upper()]
+    except KeyError:
+        return _compute_index(name)
+
+def name(index):
+    """Name of a column, given its index. Column 0 is A"""
+    if _NAMES is None:
+        _build_tables()
+    if 0 <= index < MAX_COLUMNS:
+        return _NAMES[index]
+    return _compute_name(index)
+
+def indexes(names):
+    """List of indexes of given column names"""
+    return [ index(name) for name in names ]
+
+def names(indexes):
+    """List of names of given column indexes"""
+    return [ name(index) for index in indexes ]
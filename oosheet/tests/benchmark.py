@@ -0,0 +1,364 @@
+#!/usr/bin/python3
+
+"""
+Benchmarks for OOSheet. Like run_tests.py, LibreOffice must be running and accepting
+socket connections:
+
+  libreoffice --calc --accept="socket,host=localhost,port=2002;urp;StarOffice.ServiceManager"
+
+bench_connections also needs it to accept pipe connections, with a second --accept option:
+
+  --accept="pipe,name=oosheet;urp;StarOffice.ServiceManager"
+
+Each benchmark is a function starting with bench_. All of them are run by default, or
+only the ones given as arguments:
+
+  $ python oosheet/tests/benchmark.py
+  $ python oosheet/tests/benchmark.py bench_range_writes
+
+Sheet1.A1:Z1000 may be overwritten.
+"""
+
+import sys, time, types
+from datetime import datetime
+
+from oosheet import OOSheet as S, socket_url, pipe_url
+
+def timed(function, *args):
+    """Runs function with given args and returns the number of seconds it took"""
+    start = time.time()
+    function(*args)
+    return time.time() - start
+
+def report(name, seconds, cells):
+    print('  %-30s %8.3fs %10.1f us/cell' % (name, seconds, seconds * 1000000 / cells))
+
+def bench_range_writes():
+    """Per-cell cost of value, string and formula setters, looping over cells vs one array call"""
+    sheet = S('a1:j1000')
+    cells = sheet.width * sheet.height
+
+    def loop(method, data):
+        for cell in sheet._cells:
+            getattr(cell, method)(data)
+
+    def bulk(attr, data):
+        setattr(sheet, attr, data)
+
+    report('setValue per cell', timed(loop, 'setValue', 1.5), cells)
+    report('value setter', timed(bulk, 'value', 1.5), cells)
+    report('setString per cell', timed(loop, 'setString', 'hello'), cells)
+    report('string setter', timed(bulk, 'string', 'hello'), cells)
+    report('setFormula per cell', timed(loop, 'setFormula', '=1+1'), cells)
+    report('formula setter', timed(bulk, 'formula', '=1+1'), cells)
+
+    sheet.delete()
+
+def bench_iterate_cells():
+    """Per-cell cost of iterating cells of a large selector with cells and iter_cells()"""
+    sheet = S('a1:j10000')
+    cells = sheet.width * sheet.height
+
+    report('cells', timed(lambda: [ cell for cell in sheet.cells ]), cells)
+    report('iter_cells', timed(lambda: [ cell for cell in sheet.iter_cells() ]), cells)
+    report('selector strings', timed(lambda: [ S(str(cell)) for cell in sheet.cells ]), cells)
+
+def bench_columns():
+    """Per-column cost of converting all column names and indexes of a sheet, computed vs from tables"""
+    from oosheet import columns
+
+    all_indexes = list(range(columns.MAX_COLUMNS))
+    all_names = columns.names(all_indexes)
+    cells = len(all_indexes)
+
+    report('computed name', timed(lambda: [ columns._compute_name(i) for i in all_indexes ]), cells)
+    report('name', timed(lambda: [ columns.name(i) for i in all_indexes ]), cells)
+    report('names', timed(columns.names, all_indexes), cells)
+    report('computed index', timed(lambda: [ columns._compute_index(n) for n in all_names ]), cells)
+    report('index', timed(lambda: [ columns.index(n) for n in all_names ]), cells)
+    report('indexes', timed(columns.indexes, all_names), cells)
+
+def bench_import():
+    """Time to start python and import oosheet, with and without connecting to LibreOffice"""
+    import subprocess
+
+    def run(code):
+        subprocess.check_call([sys.executable, '-c', code])
+
+    runs = 10
+    report('python', timed(lambda: [ run('pass') for i in range(runs) ]) / runs, 1)
+    report('import oosheet', timed(lambda: [ run('import oosheet') for i in range(runs) ]) / runs, 1)
+    report('import and connect', timed(lambda: [ run('import oosheet; oosheet.OOSheet("a1").value')
+                                                 for i in range(runs) ]) / runs, 1)
+
+def bench_insert_and_delete_rows():
+    """Per-row cost of inserting and deleting rows and columns"""
+    rows = 500
+    S('a1:c10').value = 1
+
+    report('insert_rows', timed(S('a2').insert_rows, rows), rows)
+    report('delete_rows', timed(S('a2:a%d' % (rows + 1)).delete_rows), rows)
+    report('insert_columns', timed(S('b1').insert_columns, rows), rows)
+    report('delete_columns', timed(lambda: S('b1').grow_right(rows - 1).delete_columns()), rows)
+
+    S('a1:c10').delete()
+
+def bench_copy():
+    """Per-cell cost of copying a range with copy() and paste() vs copy_to()"""
+    sheet = S('a1:e1000')
+    cells = sheet.width * sheet.height
+    sheet.value = 1.5
+
+    report('copy and paste', timed(lambda: sheet.copy() and S('g1').paste()), cells)
+    report('copy_to', timed(sheet.copy_to, 'g1'), cells)
+
+    S('a1:k1000').delete()
+
+def bench_format_as():
+    """Per-block cost of formatting blocks of cells with format_as()"""
+    blocks = 100
+    S('a1').range.CellBackColor = 0xff0000
+
+    report('format_as', timed(lambda: [ S('c%d:e%d' % (i * 3 + 1, i * 3 + 2)).format_as('a1')
+                                        for i in range(blocks) ]), blocks)
+
+    S('a1:e%d' % (blocks * 3)).delete()
+
+def bench_flatten():
+    """Per-cell cost of flatten()"""
+    rows = 5000
+    S('a1').value = 1
+    S('b1:c%d' % rows).formula = '=$a$1*2'
+
+    report('flatten', timed(S('b1:c%d' % rows).flatten), rows * 2)
+
+    S('a1:c%d' % rows).delete()
+
+def bench_write_grid():
+    """Per-cell cost of writing mixed rows cell by cell vs write_grid()"""
+    date = datetime(2011, 1, 20)
+    rows = [ [i, 'row %d' % i, date, i * 1.5, None] for i in range(200) ]
+    cells = len(rows) * len(rows[0])
+
+    def cell_by_cell():
+        for i, row in enumerate(rows):
+            S('a%d' % (i+1)).set_value(row[0])
+            S('b%d' % (i+1)).set_string(row[1])
+            S('c%d' % (i+1)).set_date(row[2])
+            S('d%d' % (i+1)).set_value(row[3])
+
+    report('set_* per cell', timed(cell_by_cell), cells)
+    S('a1:e200').delete()
+    report('write_grid', timed(S('a1').write_grid, rows), cells)
+    S('a1:e200').delete()
+
+def bench_range_reads():
+    """Per-cell cost of reading value, string and formula cell by cell vs values, strings and formulas"""
+    sheet = S('a1:e1000')
+    cells = sheet.width * sheet.height
+    S('a1:c1000').value = 1.5
+    S('d1:e1000').string = 'hello'
+
+    def cell_by_cell(attr):
+        for cell in sheet.cells:
+            getattr(cell, attr)
+
+    report('value per cell', timed(cell_by_cell, 'value'), cells)
+    report('values', timed(getattr, sheet, 'values'), cells)
+    report('string per cell', timed(cell_by_cell, 'string'), cells)
+    report('strings', timed(getattr, sheet, 'strings'), cells)
+    report('formula per cell', timed(cell_by_cell, 'formula'), cells)
+    report('formulas', timed(getattr, sheet, 'formulas'), cells)
+
+    sheet.delete()
+
+def bench_dates():
+    """Per-cell cost of reading and writing dates cell by cell vs dates property"""
+    sheet = S('a1:b500')
+    cells = sheet.width * sheet.height
+    date = datetime(2011, 1, 20, 12)
+
+    def cell_by_cell_write():
+        for cell in sheet.cells:
+            cell.date = date
+
+    def cell_by_cell_read():
+        for cell in sheet.cells:
+            cell.date
+
+    def bulk_write():
+        sheet.dates = date
+
+    report('date setter per cell', timed(cell_by_cell_write), cells)
+    sheet.delete()
+    report('dates setter', timed(bulk_write), cells)
+    report('date per cell', timed(cell_by_cell_read), cells)
+    report('dates', timed(getattr, sheet, 'dates'), cells)
+
+    sheet.delete()
+
+def bench_numpy():
+    """Per-cell cost of converting data_array by hand vs to_numpy() and from_numpy()"""
+    import numpy
+
+    sheet = S('a1:j1000')
+    cells = sheet.width * sheet.height
+    sheet.value = 1.5
+
+    def by_hand():
+        return numpy.array([ [ numpy.nan if isinstance(item, str) else item for item in row ]
+                             for row in sheet.data_array ])
+
+    report('data_array to array', timed(by_hand), cells)
+    report('to_numpy', timed(sheet.to_numpy), cells)
+    report('from_numpy', timed(S('a1').from_numpy, numpy.ones((1000, 10))), cells)
+
+    sheet.delete()
+
+def bench_iter_row_values():
+    """Per-cell cost of iterating rows vs iter_row_values()"""
+    sheet = S('a1:e2000')
+    cells = sheet.width * sheet.height
+    sheet.value = 1.5
+
+    def rows():
+        for row in sheet.rows:
+            [ cell.value for cell in row.cells ]
+
+    def row_values():
+        for row in sheet.iter_row_values(500):
+            pass
+
+    report('rows', timed(rows), cells)
+    report('iter_row_values', timed(row_values), cells)
+
+    sheet.delete()
+
+def bench_batch():
+    """Per-cell cost of assigning cells one by one, with and without batch()"""
+    cells = 2000
+
+    def assign():
+        for i in range(1, cells + 1):
+            S('b%d' % i).value = i
+
+    def batched():
+        with S.batch():
+            assign()
+
+    report('one by one', timed(assign), cells)
+    report('batch', timed(batched), cells)
+
+    S('b1:b%d' % cells).delete()
+
+def bench_snapshot():
+    """Cost of walking a table with shift_down_until, live vs in a snapshot"""
+    steps = 100
+    for i in range(steps):
+        S('a%d' % (i * 10 + 1)).string = 'mark'
+    # Numbers next to the marks, so that taking the snapshot reads their strings
+    S('b1').write_grid([ [ i * 1.5 ] for i in range(steps * 10) ])
+
+    def walk(sheet):
+        cell = sheet.first_row.first_column
+        for i in range(steps - 1):
+            cell.shift_down().shift_down_until('mark')
+
+    def snapshot_walk():
+        walk(S('a1:b%d' % (steps * 10)).snapshot())
+
+    report('live', timed(walk, S('a1:b%d' % (steps * 10))), steps * 10)
+    report('snapshot', timed(snapshot_walk), steps * 10)
+
+    S('a1:b%d' % (steps * 10)).delete()
+
+def bench_find():
+    """Per-cell cost of finding a string by testing each cell vs find()"""
+    sheet = S('a1:e1000')
+    cells = sheet.width * sheet.height
+    sheet.string = 'hay'
+    S('c500').string = 'needle'
+
+    def cell_by_cell():
+        return [ cell for cell in sheet.cells if cell.string == 'needle' ]
+
+    def find():
+        return list(sheet.find('needle'))
+
+    report('each cell', timed(cell_by_cell), cells)
+    report('find', timed(find), cells)
+
+    sheet.delete()
+
+def bench_search():
+    """Per-cell cost of find() vs search()"""
+    sheet = S('a1:e1000')
+    cells = sheet.width * sheet.height
+    sheet.string = 'hay'
+    S('c500').string = 'needle'
+
+    report('find', timed(lambda: list(sheet.find('needle'))), cells)
+    report('search', timed(lambda: list(sheet.search('needle', whole = True))), cells)
+
+    sheet.delete()
+
+def bench_shift_until():
+    """Per-row cost of shift_down_until, testing cell by cell vs current implementation"""
+    rows = 3000
+    S('b%d' % rows).string = 'end'
+
+    def cell_by_cell():
+        cell = S('b1')
+        while cell.string != 'end':
+            cell.shift_down()
+
+    report('cell by cell', timed(cell_by_cell), rows)
+    report('shift_down_until', timed(lambda: S('a1:c1').shift_down_until(column_b = 'end')), rows)
+    report('shift_down_until lambda', timed(lambda: S('a1:c1').shift_down_until(
+        column_b_satisfies = lambda c: c.string == 'end')), rows)
+
+    S('b%d' % rows).delete()
+
+def bench_end_of_data():
+    """Per-row cost of finding the end of a table with shift_down_until(None) vs a row by row loop"""
+    rows = 3000
+    S('a1:c%d' % rows).value = 1
+
+    def row_by_row():
+        cell = S('b1')
+        while cell.formula != '':
+            cell.shift_down()
+
+    report('row by row', timed(row_by_row), rows)
+    report('shift_down_until(None)', timed(lambda: S('b1').shift_down_until(None)), rows)
+    report('end_of_data_down', timed(lambda: S('b1').end_of_data_down()), rows)
+
+    S('a1:c%d' % rows).delete()
+
+def bench_connections():
+    """Per-call cost of reading one cell through a socket vs a named pipe"""
+    calls = 2000
+
+    def read(cell):
+        for i in range(calls):
+            cell.getValue()
+
+    for name, url in (('socket', socket_url()), ('pipe', pipe_url('oosheet'))):
+        try:
+            cell = S('a1', url = url).cell
+        except Exception as error:
+            print('  %-30s not available: %s' % (name, error))
+        else:
+            report(name, timed(read, cell), calls)
+
+def benchmarks():
+    names = sys.argv[1:]
+    for name, function in sorted(globals().items()):
+        if type(function) is types.FunctionType and name.startswith('bench_'):
+            if not names or name in names:
+                yield name, function
+
+if __name__ == '__main__':
+    for name, function in benchmarks():
+        print('%s: %s' % (name, function.__doc__))
+        function()
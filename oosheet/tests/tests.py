@@ -35,6 +35,27 @@ def test_column_name_vs_index_conversion():
     assert name(26) == 'AA'
     assert name(31) == 'AF'
 
+def test_column_conversion_covers_whole_sheet():
+    from oosheet.columns import index, name, indexes, names, MAX_COLUMNS
+
+    assert name(MAX_COLUMNS - 1) == 'XFD'
+    assert index('xfd') == MAX_COLUMNS - 1
+    assert name(MAX_COLUMNS) == 'XFE'
+    assert index('XFE') == MAX_COLUMNS
+
+    assert names([0, 27, 701, 702]) == ['A', 'AB', 'ZZ', 'AAA']
+    assert indexes(['a', 'AB', 'zz', 'AAA']) == [0, 27, 701, 702]
+
+def test_import_does_not_load_pyuno():
+    import subprocess, sys
+
+    if S().macro_environment:
+        return
+
+    code = "import sys, oosheet; print(sorted(m for m in ('uno', 'pyuno', 'zipfile', 'subprocess') if m in sys.modules))"
+    output = subprocess.check_output([sys.executable, '-c', code])
+    assert output.strip() == b'[]'
+
 def test_value():
     S('a1').value = 10
 
@@ -69,6 +90,41 @@ def test_date():
     assert S('a1').date == datetime(2010, 12, 22)
     assert '/' in S('a1').string
 
+def test_date_keeps_time_of_day():
+    S('a1').date = datetime(2010, 12, 17, 18)
+
+    assert S('a1').value == 40529.75
+    assert S('a1').date == datetime(2010, 12, 17, 18)
+
+def test_dates_of_range():
+    S('a1:b2').dates = [[datetime(2011, 1, 1), None],
+                        [datetime(2011, 1, 2, 18), datetime(2011, 1, 3)]]
+
+    assert S('a1:b2').dates == ((datetime(2011, 1, 1), None),
+                                (datetime(2011, 1, 2, 18), datetime(2011, 1, 3)))
+    assert S('a2').value == 40545.75
+    assert S('b1').formula == ''
+    assert '/' in S('b2').string
+
+    S('a1:b2').set_dates(datetime(2011, 2, 1))
+    assert S('b1').date == datetime(2011, 2, 1)
+
+def test_errors_have_no_data():
+    S('a1').value = 40545
+    S('a2').formula = '=1/0'
+
+    assert S('a1:a2').values == ((40545, ), (None, ))
+    assert S('a1:a2').dates == ((datetime(2011, 1, 2), ), (None, ))
+    assert S('a1:a2').strings == ((S('a1').string, ), ('#DIV/0!', ))
+    assert S('a1').shift_down_until(column_a_satisfies = lambda c: c.value == 0) == S('a2')
+
+    S('a1').formula = '=2+3'
+    S('a3').formula = '=5*2'
+    S('b2').formula = '=5+1'
+    S('a1:b3').flatten()
+    assert S('a1:b3').formulas == (('5', ''), ('=1/0', '6'), ('10', ''))
+    assert S('a2').string == '#DIV/0!'
+
 @dev
 def test_date_only_sets_format_if_not_already_in_date_format():
     S().sheet.getCellRangeByName('Sheet1.A1').NumberFormat = 30
@@ -122,6 +178,17 @@ def test_data_of_multiple_cells_can_be_changed():
     assert S('h11').value == 0
     assert S('g10').value == 17
 
+def test_range_is_the_whole_selector():
+    address = S('b2:d5').range.getRangeAddress()
+
+    assert (address.StartColumn, address.StartRow) == (1, 1)
+    assert (address.EndColumn, address.EndRow) == (3, 4)
+
+def test_string_set_on_range_is_not_parsed():
+    S('a1:b2').string = '10'
+    assert S('b2').formula == u"'10"
+    assert S('b2').value == 0
+
 def test_selection_has_width_and_height():
     assert S('a1').width == 1
     assert S('a1').height == 1
@@ -183,6 +250,72 @@ def test_selector_handles_sheets():
 
     S('Sheet2.a1:g10').delete()
 
+def test_derived_selectors_keep_sheet():
+    """This test requires english OpenOffice"""
+    S('Sheet2.a1:b2').value = 7
+
+    assert [ str(cell) for cell in S('Sheet2.a1:b2').cells ] == ['Sheet2.A1', 'Sheet2.A2', 'Sheet2.B1', 'Sheet2.B2']
+    assert str(S('Sheet2.a1:b2')[1]) == 'Sheet2.A2:B2'
+    assert S('Sheet2.a1:b2')['B'][1].value == 7
+
+    S('Sheet2.a1:b2').delete()
+
+def test_selector_ignores_dollar_signs():
+    assert str(S('$a$1:$b$3')) == 'Sheet1.A1:B3'
+
+def test_sheets_are_cached_until_invalidated():
+    """This test requires english OpenOffice"""
+    sheet = S('Sheet2.a1').sheet
+    assert S('Sheet2.b2').sheet is sheet
+
+    sheets = S('a1').model.Sheets
+    sheets.insertNewByName('Cached', 0)
+    try:
+        S('a1').invalidate_sheets()
+        assert S('a1').sheet_name == 'Cached'
+        assert S('Cached.a1').sheet_name == 'Cached'
+    finally:
+        sheets.removeByName('Cached')
+        S('a1').invalidate_sheets()
+
+    assert S('a1').sheet_name == 'Sheet1'
+
+def test_sheet_changes_through_uno_are_noticed():
+    """This test requires english OpenOffice"""
+    assert S('a1').sheet_name == 'Sheet1'
+    cell = S('Sheet2.a1')
+
+    sheets = S('a1').model.Sheets
+    sheets.insertNewByName('Noticed', 0)
+    try:
+        assert S('a1').sheet_name == 'Noticed'
+        sheets.getByName('Sheet2').Name = 'Renamed'
+        assert S('Renamed.a1').sheet_name == 'Renamed'
+        assert str(cell) == 'Renamed.A1'
+    finally:
+        sheets.getByName('Renamed').Name = 'Sheet2'
+        sheets.removeByName('Noticed')
+
+    assert S('a1').sheet_name == 'Sheet1'
+    assert str(cell) == 'Sheet2.A1'
+
+def test_selectors_follow_renamed_sheets():
+    """This test requires english OpenOffice"""
+    cell = S('Sheet2.a1')
+    range = S('Sheet2.a1:b2')
+
+    S('a1').model.Sheets.getByName('Sheet2').Name = 'Renamed'
+    try:
+        S('a1').invalidate_sheets()
+        assert cell.sheet_name == 'Renamed'
+        assert str(range) == 'Renamed.A1:B2'
+        assert range.shift_right() == S('Renamed.b1:c2')
+    finally:
+        S('a1').model.Sheets.getByName('Renamed').Name = 'Sheet2'
+        S('a1').invalidate_sheets()
+
+    assert str(cell) == 'Sheet2.A1'
+
 def test_delete():
     S('a1').value = 1
     S('a1').delete()
@@ -278,6 +411,17 @@ def test_several_columns_can_be_inserted():
     assert S('d2').value == 6
     assert S('g2').value == 6
 
+def test_rows_inserted_before_selector_of_several_rows():
+    S('a1:a2').value = 1
+    S('a3').value = 3
+
+    result = S('a1:a2').insert_rows(3)
+
+    assert result == S('a1:a5')
+    assert S('a4').value == 1
+    assert S('a6').value == 3
+    assert S('a1').string == ''
+
 def test_delete_rows():
     S('d5').value = 2
     S('a2').delete_rows()
@@ -313,6 +457,30 @@ def test_copy_cut_and_paste():
     assert S('a1').value == 0
     assert S('c1').value == 4
 
+def test_copy_to_and_move_to():
+    S('a1').value = 4
+    S('a2').formula = '=a1*2'
+
+    copied = S('a1:a2').copy_to('c5')
+
+    assert copied == S('c5:c6')
+    assert S('c6').formula == '=C5*2'
+    assert S('c6').value == 8
+    assert S('a2').value == 8
+
+    moved = S('a1:a2').move_to(S('e1:g10'))
+
+    assert moved == S('e1:e2')
+    assert S('e2').value == 8
+    assert S('a1').string == ''
+
+    copied.copy_to('Sheet2.a1').shift_right().set_value(3)
+
+    assert S('Sheet2.a2').value == 8
+    assert S('Sheet2.b1').value == 3
+
+    S('Sheet2.a1:b2').delete()
+
 def test_copy_cut_and_paste_can_be_cascaded():
     S('a1').set_value(12).copy().set_value(15).shift_right().paste().shift_down().set_value(18).cut().shift_left().paste()
     assert S('a1').value == 15
@@ -437,6 +605,66 @@ def test_shift_until_accepts_none_for_empty_cell():
     assert S('a2:z2').shift_down_until(column_f = None) == S('A11:Z11')
     assert S('a2:z2').shift_down_until(column_g = None) == S('A10:Z10')
 
+def test_shift_until_scans_far_in_blocks():
+    S('c3000').string = 'end'
+    try:
+        assert S('a1:d1').shift_down_until(column_c = 'end') == S('A3000:D3000')
+        assert S('c1').shift_down_until(column_c_satisfies = lambda c: c.formula == 'end') == S('C3000')
+        assert S('c3000').shift_up_until(None) == S('C2999')
+    finally:
+        S('c3000').delete()
+
+def test_shift_until_gives_cell_to_lambda():
+    S('b5').value = 3
+    S('c5').formula = '=b5*2'
+
+    assert S('a1:c1').shift_down_until(column_c_satisfies = lambda c: c.value == 6) == S('A5:C5')
+    assert S('a1:c1').shift_down_until(column_c_satisfies = lambda c: c.formula == '=B5*2') == S('A5:C5')
+    assert S('a1:c1').shift_down_until(column_b_satisfies = lambda c: c.shift_right().value == 6) == S('A5:C5')
+
+def test_shift_until_lambda_can_set_attributes():
+    S('b5').value = 3
+
+    def mark(cell):
+        if cell.value == 3:
+            cell.string = 'found'
+            return True
+        return False
+
+    assert S('a1:b1').shift_down_until(column_b_satisfies = mark) == S('a5:b5')
+    assert S('b5').string == 'found'
+
+def test_used_range_and_end_of_data():
+    S('b2').set_value(1).drag_to('b10').drag_to('d10')
+    S('f20').value = 5
+
+    assert S('a1').used_range == S('b2:f20')
+    assert S('c5').current_region == S('b2:d10')
+    assert S('c5').end_of_data_down() == S('c10')
+    assert S('c5').end_of_data_up() == S('c2')
+    assert S('c5:c6').end_of_data_right() == S('d5:d6')
+    assert S('c5').end_of_data_left() == S('b5')
+
+def test_end_of_data_goes_to_border_of_region_with_uneven_columns():
+    S('b2').set_value(1).drag_to('b10')
+    S('c2').set_value(1).drag_to('c5')
+
+    assert S('c3').current_region == S('b2:c10')
+    assert S('c3').end_of_data_down() == S('c10')
+    assert S('c10').formula == ''
+    assert S('c3').shift_down_until(None) == S('c6')
+
+def test_shift_until_none_beyond_used_area():
+    S('b2').set_value(1).drag_to('b10').drag_to('d10')
+    S('c6').delete()
+
+    assert S('c2').shift_down_until(None) == S('c6')
+    assert S('c10').shift_up_until(None) == S('c6')
+    assert S('b2').shift_down_until(None) == S('b11')
+    assert S('b2').shift_right_until(None) == S('e2')
+    assert S('a2:z2').shift_down_until(column_d = None) == S('a11:z11')
+    assert S('h3').shift_down_until(None) == S('h3')
+
 def test_shift_right():
     S('a1').set_value(1).drag_to('a10').drag_to('f10')
     S('c1').set_value(100).drag_to('c10')
@@ -594,6 +822,25 @@ def test_flatten_works_with_zero_formatted_as_string():
     S('a1').flatten()
     assert S('a3').string == string    
 
+def test_flatten_in_blocks_keeps_format():
+    S('a1').value = 2
+    S('b1').formula = '=a1*3'
+    S('b1').drag_to('b10')
+    S().sheet.getCellRangeByName('Sheet1.B1:B10').NumberFormat = 105 # $0.--
+    string = S('b10').string
+
+    block_rows = S.block_rows
+    S.block_rows = 3
+    try:
+        S('b1:b10').flatten()
+    finally:
+        S.block_rows = block_rows
+    S('a1').value = 0
+
+    assert S('b1').formula == '6'
+    assert S('b10').value == 6
+    assert S('b10').string == string
+
 def test_protection():
     S('a1').unprotect()
     S('a2').protect()
@@ -673,6 +920,20 @@ def test_format_as():
     S('a3').format_as(S('a1'))
     assert S('a3').string.split()[0] == weekday
 
+def test_format_as_repeats_formatting_and_removes_other():
+    S('a1').range.CellBackColor = 0xff0000
+    S('a2').range.CharWeight = 150 # bold
+    S('c2').range.CharColor = 0x00ff00
+
+    S('c1:c4').format_as('a1:a2')
+
+    assert S('c1').range.CellBackColor == 0xff0000
+    assert S('c3').range.CellBackColor == 0xff0000
+    assert S('c2').range.CharWeight == 150
+    assert S('c4').range.CharWeight == 150
+    assert S('c2').range.CellBackColor == S('a2').range.CellBackColor
+    assert S('c2').range.CharColor == S('a2').range.CharColor
+
 def test_data_array():
     S('a1').value = 1
     S('a2').formula = '=a1 * 2'
@@ -687,6 +948,283 @@ def test_data_array():
     assert len(S('a1:c7').data_array[1]) == 3
     assert S('a1:d7').data_array[5][1] == 48
 
+def test_values_formulas_and_strings_of_range():
+    S('a1').value = 1
+    S('b1').string = 'hello'
+    S('a2').formula = '=a1 * 2'
+    S('b2').formula = '=b1'
+
+    assert S('a1:c2').values == ((1, 'hello', ''), (2, 'hello', ''))
+    assert S('a1:c2').formulas == ((u'1', u'hello', u''), (u'=A1*2', u'=B1', u''))
+    assert S('a1:c2').strings == ((u'1', u'hello', u''), (u'2', u'hello', u''))
+    assert S('a1:c2').data_array == S('a1:c2').values
+
+def test_strings_of_numbers_follow_format():
+    S('a1').write_grid([[1], [0.5], [1e20], [datetime(2011, 3, 1)]])
+    S('b1').formula = '=1=1'
+
+    strings = S('a1:b4').strings
+    assert [ row[0] for row in strings[:3] ] == [ S('a1').string, S('a2').string, S('a3').string ]
+    assert strings[3][0] == S('a4').string
+    assert strings[0][1] == S('b1').string
+
+def test_write_grid():
+    date = datetime(2011, 3, 1)
+
+    result = S('b2').write_grid([[1, 'one', date],
+                                 [2.5, None],
+                                 [True, '10', date]])
+
+    assert result == S('b2:d4')
+    assert S('b2').value == 1
+    assert S('c2').string == 'one'
+    assert S('d2').date == date
+    assert S('b3').value == 2.5
+    assert S('c3').formula == ''
+    assert S('d3').formula == ''
+    assert S('b4').value == 1
+    assert S('c4').formula == u"'10"
+    assert '/' in S('d4').string
+    assert '/' not in S('b3').string
+
+def test_write_grid_keeps_date_formats_and_shows_time():
+    S().sheet.getCellRangeByName('Sheet1.A1').NumberFormat = 38
+
+    S('a1').write_grid([[datetime(2011, 3, 1), datetime(2011, 3, 1, 18, 30)],
+                        [datetime(2011, 3, 2), datetime(2011, 3, 2)]])
+
+    assert S().sheet.getCellRangeByName('Sheet1.A1').NumberFormat == 38
+    assert ':' not in S('a2').string
+    assert ':' in S('b1').string
+    assert ':' in S('b2').string
+
+def test_iter_blocks_and_row_values():
+    S('a1').set_value(1).drag_to('a10').drag_to('b10')
+
+    blocks = list(S('a1:b10').iter_blocks(4))
+    assert [ len(block) for block in blocks ] == [4, 4, 2]
+    assert blocks[0][0] == (1, 2)
+    assert blocks[2][1] == (10, 11)
+
+    rows = list(S('a1:b10').iter_row_values(3))
+    assert len(rows) == 10
+    assert rows[4] == (5, 6)
+
+def test_numpy_conversion():
+    try:
+        import numpy
+    except ImportError:
+        return # numpy is optional
+
+    array = numpy.arange(12.0).reshape(4, 3)
+    array[1, 1] = numpy.nan
+
+    assert S('b2').from_numpy(array, block_rows = 3) == S('b2:d5')
+    assert S('c3').formula == ''
+    assert S('d5').value == 11
+
+    S('c2').string = 'text'
+    result = S('b2:d5').to_numpy(block_rows = 3)
+    assert result.shape == (4, 3)
+    assert numpy.isnan(result[0, 1])
+    assert numpy.isnan(result[1, 1])
+    assert result[3, 2] == 11
+
+def test_to_numpy_with_integer_dtype():
+    try:
+        import numpy
+    except ImportError:
+        return # numpy is optional
+
+    S('a1').write_grid([[1, 2], [3, 4]])
+    result = S('a1:b2').to_numpy(dtype = int)
+    assert result.dtype == numpy.dtype(int)
+    assert result.tolist() == [[1, 2], [3, 4]]
+
+    try:
+        S('a1:b3').to_numpy(dtype = int)
+    except ValueError:
+        pass
+    else:
+        assert False
+
+def test_iter_cells():
+    cells = list(S('a1:b2').iter_cells())
+    assert [ str(cell) for cell in cells ] == ['Sheet1.A1', 'Sheet1.A2', 'Sheet1.B1', 'Sheet1.B2']
+
+    cells[0].value = 2
+    cells[1].string = 'hello'
+    cells[2].formula = 'a1*3'
+    cells[3].date = datetime(2011, 1, 20)
+
+    assert S('a1').value == 2
+    assert cells[1].string == 'hello'
+    assert cells[2].value == 6
+    assert cells[2].formula == '=A1*3'
+    assert cells[3].date == datetime(2011, 1, 20)
+    assert cells[3].to_sheet() == S('b2')
+
+def test_connections_are_kept_per_url():
+    from oosheet import socket_url
+
+    url = socket_url()
+    assert S('a1', url = url).connection is S('b2', url = url).connection
+    assert S('a1', url = url)[0].url == url
+    assert S('Sheet2.a1', url = url).sheet_name == 'Sheet2'
+
+def test_pool_binds_connection_to_thread():
+    import threading
+    from oosheet import OODocPool
+
+    pool = OODocPool([S('a1').url])
+    connections = []
+
+    def work():
+        with pool.connection() as connection:
+            S('a1').value = 3
+            connections.extend([connection, S('a1').connection, S('a1:b2')[0].connection])
+
+    thread = threading.Thread(target = work)
+    thread.start()
+    thread.join()
+
+    assert connections[1] is connections[0]
+    assert connections[2] is connections[0]
+    assert S('a1').connection is not connections[0]
+    assert S('a1').value == 3
+
+def test_async_sheet():
+    import asyncio
+    from oosheet.aio import AsyncOOSheet
+
+    async def work():
+        await AsyncOOSheet('a1:b2').set_value(2)
+        grid = await AsyncOOSheet('d1').write_grid([[1, 'hello']])
+        return await AsyncOOSheet('a1:b2').values(), await grid.values(), grid
+
+    values, grid_values, grid = asyncio.run(work())
+
+    assert values == ((2, 2), (2, 2))
+    assert grid_values == ((1, 'hello'),)
+    assert grid.selector == 'Sheet1.D1:E1'
+    assert S('d1').value == 1
+
+def test_farm_restarts_dead_workers():
+    from oosheet import OOFarm
+
+    if S().macro_environment:
+        return
+
+    with OOFarm(1, base_port = 2102) as farm:
+        with farm.pool().connection():
+            assert S('a1').model is not None
+
+        farm.processes[0].kill()
+        farm.processes[0].wait()
+        assert farm.check() == [0]
+        assert farm.check() == []
+
+def test_pool_reconnects_to_restarted_worker():
+    from oosheet import OOFarm
+
+    if S().macro_environment:
+        return
+
+    with OOFarm(1, base_port = 2102) as farm:
+        pool = farm.pool()
+        with pool.connection():
+            S('a1').value = 1
+
+        farm.processes[0].kill()
+        farm.processes[0].wait()
+        farm.check()
+
+        # The bridge to the killed instance is dead
+        try:
+            with pool.connection():
+                S('a1').value = 2
+        except Exception:
+            pass
+        else:
+            assert False
+
+        with pool.connection(timeout = 5):
+            S('a1').value = 3
+            assert S('a1').value == 3
+
+def test_pool_opens_documents_in_farm_workers():
+    import os, tempfile
+    from oosheet import OOFarm
+
+    if S().macro_environment:
+        return
+
+    filename = os.path.join(tempfile.mkdtemp(), 'pooled.ods')
+    with OOFarm(1, base_port = 2102) as farm:
+        pool = farm.pool()
+        with pool.connection():
+            S('a1').value = 7
+            OODoc().save_as(filename)
+
+        with pool.connection():
+            OODoc().open(filename)
+            assert S('a1').value == 7
+
+def test_batch_is_flushed_before_document_events():
+    sheet = S('a1').sheet
+    with S.batch():
+        S('a1').value = 5
+        assert sheet.getCellByPosition(0, 0).getValue() == 0
+
+        OODoc().dispatch('calculate')
+        assert sheet.getCellByPosition(0, 0).getValue() == 5
+
+def test_batch_writes():
+    with S.batch():
+        for i in range(1, 11):
+            S('b%d' % i).value = i
+        S('c1:c10').string = 'text'
+
+        assert S('b3').value == 3
+        assert S('c3').string == 'text'
+        assert S('c3').value == 0
+
+        S('d1').formula = '=b1+b2'
+        assert S('d1').value == 3
+
+        S('b1').value = 5
+
+    assert S('b10').value == 10
+    assert S('c10').string == 'text'
+    assert S('d1').value == 7
+
+def test_snapshot():
+    S('c10').string = 'total'
+    S('d11').value = 19
+
+    snapshot = S('a1:z20').snapshot()
+    S('c10').string = 'changed'
+
+    assert snapshot == S('a1:z20')
+    assert snapshot[0].shift_down_until(column_c = 'total') == S('A10:Z10')
+    assert snapshot[0].grow_down_until(column_d = 19) == S('A1:Z11')
+    assert snapshot['D'][10].value == 19
+    assert snapshot['C'][9].string == 'total'
+    assert [ cell for cell in snapshot.find('total') ] == [ S('c10') ]
+    assert snapshot['D'][12].shift_down_until(None) == S('d13')
+
+    try:
+        snapshot[0].value = 1
+        assert False
+    except TypeError:
+        pass
+
+    try:
+        snapshot['A'][19].shift_down_until(column_a = 'never')
+        assert False
+    except IndexError:
+        pass
+
 def test_iterator():
     for cell in S('a1:10'):
         cell.value = 31
@@ -824,6 +1362,37 @@ def test_find_accepts_function_as_query():
     assert result[9] == S('D6')
     assert result[10] == S('D7')
 
+def test_find_numbers_and_numeric_strings():
+    S('b2').value = 10
+    S('c3').string = '10'
+    S('d4').string = 'ten'
+
+    assert [ cell for cell in S('a1:d4').find(10) ] == [ S('b2') ]
+    assert [ cell for cell in S('a1:d4').find('10') ] == [ S('b2'), S('c3') ]
+    assert [ cell for cell in S('a1:d4').find('ten') ] == [ S('d4') ]
+
+def test_find_booleans_by_string():
+    S('b2').formula = '=1=1'
+    S('c3').value = 1
+
+    assert [ cell for cell in S('a1:d4').find('TRUE') ] == [ S('b2') ]
+    assert [ cell for cell in S('a1:d4').find('1') ] == [ S('c3') ]
+
+def test_search():
+    S('a1').string = 'Total sales'
+    S('b3').string = 'total'
+    S('c2').string = 'subtotal'
+    S('f1').string = 'total'
+
+    def cells(found):
+        return sorted([ cell.selector for cell in found ])
+
+    assert cells(S('a1:d5').search('total')) == ['Sheet1.A1', 'Sheet1.B3', 'Sheet1.C2']
+    assert cells(S('a1:d5').search('total', case = True)) == ['Sheet1.B3', 'Sheet1.C2']
+    assert cells(S('a1:d5').search('total', whole = True)) == ['Sheet1.B3']
+    assert cells(S('a1:d5').search('^sub', regex = True)) == ['Sheet1.C2']
+    assert cells(S('a1:d5').search('nothing')) == []
+
 def test_each():
     S('a1:a10').each(lambda cell: cell.set_string('%s-' % str(cell)))
 
@@ -13,6 +13,7 @@ setup(name = 'oosheet',
           'console_scripts': [
               'oosheet-pack = oosheet:pack',
               'oosheet-launch = oosheet:launch',
+              'oosheet-run = oosheet:run',
               ]
           },
       # Why isn't install_requires working?